@@ -0,0 +1,379 @@
+import argparse
+import base64
+import hashlib
+import json
+import os
+
+from taskscheduler import TaskScheduler
+from prepare_tasks import prepare_tasks
+
+SCOPES = ['https://www.googleapis.com/auth/calendar']
+
+
+def unit_hash_helper(user, tasks, engine, starting_time, date):
+    """
+    Helper function that returns the hash identifying one unit of a batch: a user's task set and the run settings
+
+    Parameters
+    ----------
+    user : str
+        name of the user
+    tasks : list[dict]
+        the user's task dictionaries (in the format of tasks.py)
+    engine : str
+        a name from TaskScheduler.ENGINES or "auto"
+    starting_time : int/float
+        time (in minutes) to start task scheduler
+    date : str
+        day of the events, as YYYY-MM-DD
+
+    Returns
+    ----------
+    str
+        SHA-256 hex digest of the unit
+
+    """
+    unit = json.dumps([user, tasks, engine, starting_time, date], sort_keys=True, default=str)
+    return hashlib.sha256(unit.encode()).hexdigest()
+
+
+def event_id_helper(unit, index):
+    """
+    Helper function that returns the id of the event of the index-th scheduled task of a unit. The id only depends on
+    the unit and the index, so an event inserted again after a crash is recognized by the calendar instead of duplicated
+
+    Parameters
+    ----------
+    unit : str
+        hash of the unit (see unit_hash_helper)
+    index : int
+        position of the task in the unit's schedule
+
+    Returns
+    ----------
+    str
+        the event id, in base32hex (the characters a-v and 0-9 the Calendar API accepts)
+
+    """
+    return base64.b32hexencode(bytes.fromhex(unit) + index.to_bytes(4, "big")).decode().lower().rstrip("=")
+
+
+def is_duplicate_event_helper(error):
+    """
+    Helper function that checks whether an error from the Calendar API means an event with the same id already exists
+
+    Parameters
+    ----------
+    error : Exception
+        error raised by an insert request
+
+    Returns
+    ----------
+    bool
+        whether the server answered 409 Conflict
+
+    """
+    return getattr(getattr(error, 'resp', None), 'status', None) == 409
+
+
+def format_time(time):
+    """
+    Formats given time (in minutes) to a string showing hours and minutes (time in the day)
+
+    Parameters
+    ----------
+    time : int/float
+    time (in minutes) to be formatted
+
+    Returns
+    ----------
+    str
+    a string representation of the time in the day
+
+    """
+    return f"{int(time//60):02d}:{round(int(time%60), 2):02d}:00"
+
+
+def event_body_helper(task, index, date):
+    """
+    Helper function that returns the Calendar event of a scheduled task, shared by the batch runs and the daemon
+
+    Parameters
+    ----------
+    task : dict
+        a scheduled task with its start time, as returned by TaskScheduler.schedule_slots
+    index : int
+        position of the task among the exported tasks, shown in the event summary
+    date : str
+        day of the event, as YYYY-MM-DD
+
+    Returns
+    ----------
+    dict
+        the event body for events().insert
+
+    """
+    return {
+        'summary': f'{index+1}: {task["description"]}',
+        'description': task["description"],
+        'start': {
+            'dateTime': f'{date}T{format_time(task["start"])}+05:30',
+            'timeZone': 'America/Los_Angeles',
+        },
+        'end': {
+            'dateTime': f'{date}T{format_time(task["start"] + task["duration"])}+05:30',
+            'timeZone': 'America/Los_Angeles',
+        },
+    }
+
+
+class BatchJournal:
+    """
+    Defining the BatchJournal class, an append-only JSON-lines log of the progress of a batch run.
+    Every record is flushed to disk before the step it records is considered done, so after a crash the journal
+    holds every finished step and at most one torn last line, which is ignored.
+
+    Records (one JSON object per line):
+    {"type": "scheduled", "hash": str, "user": str, "result": dict}
+        a unit was solved, result holds the scheduled tasks with their start times and the total utility
+    {"type": "event", "hash": str, "index": int, "event_id": str}
+        the event of the index-th scheduled task of a unit was created
+    {"type": "done", "hash": str, "user": str, "event_ids": list}
+        a unit was solved and all its events were created
+    {"type": "failed", "hash": str, "user": str, "error": str}
+        a unit failed, it is retried by the next run
+
+    Attributes
+    ----------
+    path : str
+        path of the journal file
+    results : dict
+        result of each solved unit by hash
+    event_ids : dict
+        id of each created event by index, for each unit by hash
+    done : set
+        hashes of the finished units
+    file : io.TextIOWrapper
+        the journal, opened for appending
+
+    Methods
+    -------
+    record(record)
+        Appends a record to the journal and applies it
+    apply(record)
+        Applies a record to the progress kept in memory
+    close()
+        Closes the journal
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.results = {}
+        self.event_ids = {}
+        self.done = set()
+
+        torn = False
+        if os.path.exists(path):
+            with open(path) as journal:
+                for line in journal:
+                    try:
+                        self.apply(json.loads(line))
+                    except json.JSONDecodeError:
+                        # a line torn by a crash while it was being written
+                        continue
+                    finally:
+                        torn = not line.endswith("\n")
+        self.file = open(path, "a")
+        # end a torn last line, so the next record starts on its own line
+        if torn:
+            self.file.write("\n")
+
+    def record(self, record):
+        """
+        Appends a record to the journal, waits for it to reach the disk and applies it
+
+        Parameters
+        ----------
+        record : dict
+            the record
+
+        Returns
+        ----------
+        None
+
+        """
+        self.file.write(json.dumps(record, default=str) + "\n")
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.apply(record)
+
+    def apply(self, record):
+        """
+        Applies a record to the progress kept in memory
+
+        Parameters
+        ----------
+        record : dict
+            the record
+
+        Returns
+        ----------
+        None
+
+        """
+        if record["type"] == "scheduled":
+            self.results[record["hash"]] = record["result"]
+        elif record["type"] == "event":
+            self.event_ids.setdefault(record["hash"], {})[record["index"]] = record["event_id"]
+        elif record["type"] == "done":
+            self.done.add(record["hash"])
+
+    def close(self):
+        """
+        Closes the journal
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        None
+
+        """
+        self.file.close()
+
+
+def schedule_unit_helper(tasks, engine, starting_time):
+    """
+    Helper function that schedules one user's tasks
+
+    Parameters
+    ----------
+    tasks : list[dict]
+        the user's task dictionaries (in the format of tasks.py)
+    engine : str
+        a name from TaskScheduler.ENGINES or "auto"
+    starting_time : int/float
+        time (in minutes) to start task scheduler
+
+    Returns
+    ----------
+    dict
+        the scheduled tasks with their start times and the total utility
+
+    """
+    return TaskScheduler(prepare_tasks(tasks)).schedule_slots(starting_time, engine)
+
+
+def run_batch(task_sets, journal_path, calendar_for=None, engine="dp", starting_time=4*60, date="2023-03-18"):
+    """
+    Schedules every user's tasks and exports them to their calendars, resuming from the journal of earlier runs:
+    finished units are skipped, units that were solved but not fully exported reuse the journaled result and only
+    create the events not journaled yet, and failed or missing units are run again. A unit that fails is journaled
+    and the batch moves on to the next one. Every event has an id derived from its unit and index, so an event that
+    was created but not journaled before a crash is found by the calendar (409 Conflict) rather than created twice.
+
+    Parameters
+    ----------
+    task_sets : dict
+        task dictionaries (in the format of tasks.py) for each user
+    journal_path : str
+        path of the journal file, created if missing
+    calendar_for : callable
+        returns the Calendar client of a user, nothing is exported if None (default None)
+    engine : str
+        a name from TaskScheduler.ENGINES or "auto" (default "dp")
+    starting_time : int/float
+        time (in minutes) to start task scheduler (default 4*60)
+    date : str
+        day of the events, as YYYY-MM-DD (default "2023-03-18")
+
+    Returns
+    ----------
+    dict
+        "done", "skipped" and "failed" user names of this run
+
+    """
+    journal = BatchJournal(journal_path)
+    summary = {"done": [], "skipped": [], "failed": []}
+
+    try:
+        for user, tasks in task_sets.items():
+            unit = unit_hash_helper(user, tasks, engine, starting_time, date)
+            if unit in journal.done:
+                summary["skipped"].append(user)
+                continue
+
+            try:
+                if unit not in journal.results:
+                    journal.record({"type": "scheduled", "hash": unit, "user": user,
+                                    "result": schedule_unit_helper(tasks, engine, starting_time)})
+
+                event_ids = journal.event_ids.get(unit, {})
+                if calendar_for is not None:
+                    service = calendar_for(user)
+                    # busy blocks come from a calendar already, so they are not exported
+                    tasks_to_export = [task for task in journal.results[unit]["tasks"] if not task.get("busy", False)]
+                    for index, task in enumerate(tasks_to_export):
+                        # events created before a crash are not created again
+                        if index in event_ids:
+                            continue
+                        event = {'id': event_id_helper(unit, index), **event_body_helper(task, index, date)}
+                        try:
+                            event = service.events().insert(calendarId='primary', body=event).execute()
+                        except Exception as error:
+                            # the event was created before a crash, only its record is missing
+                            if not is_duplicate_event_helper(error):
+                                raise
+                        journal.record({"type": "event", "hash": unit,
+                                        "index": index, "event_id": event.get('id')})
+                        event_ids = journal.event_ids[unit]
+
+                journal.record({"type": "done", "hash": unit, "user": user,
+                                "event_ids": [event_ids[index] for index in sorted(event_ids)]})
+                summary["done"].append(user)
+            except Exception as error:
+                journal.record({"type": "failed", "hash": unit, "user": user,
+                                "error": f"{type(error).__name__}: {error}"})
+                summary["failed"].append(user)
+    finally:
+        journal.close()
+
+    return summary
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Schedule and export the tasks of many users, resuming interrupted runs")
+    parser.add_argument("task_sets", help="JSON file mapping each user to their tasks (in the format of tasks.py)")
+    parser.add_argument("--journal", default="batch_journal.jsonl")
+    parser.add_argument("--engine", default="dp")
+    parser.add_argument("--starting-time", type=int, default=4*60)
+    parser.add_argument("--date", default="2023-03-18")
+    parser.add_argument("--tokens", default=".", help="directory of each user's <user>.json Google credentials")
+    args = parser.parse_args()
+
+    def calendar_helper(user):
+        """
+        Helper function that builds the Calendar client of a user from their stored credentials
+
+        Parameters
+        ----------
+        user : str
+            name of the user
+
+        Returns
+        ----------
+        googleapiclient.discovery.Resource
+            the Calendar client
+
+        """
+        from googleapiclient.discovery import build
+        from google.oauth2.credentials import Credentials
+
+        creds = Credentials.from_authorized_user_file(os.path.join(args.tokens, f"{user}.json"), SCOPES)
+        return build('calendar', 'v3', credentials=creds)
+
+    with open(args.task_sets) as task_sets:
+        print(run_batch(json.load(task_sets), args.journal, calendar_helper,
+                        args.engine, args.starting_time, args.date))
@@ -0,0 +1,227 @@
+import datetime
+import json
+import os
+
+
+def is_sync_token_expired_helper(error):
+    """
+    Helper function that checks whether an error from the Calendar API means the sync token is no longer valid
+
+    Parameters
+    ----------
+    error : Exception
+        error raised by a list request
+
+    Returns
+    ----------
+    bool
+        whether the server answered 410 Gone
+
+    """
+    return getattr(getattr(error, 'resp', None), 'status', None) == 410
+
+
+class BusyTimeImporter:
+    """
+    Defining the BusyTimeImporter class, which keeps a local cache of the events in a calendar
+    and turns them into fixed-time blocks for the task scheduler.
+
+    The first sync lists the whole calendar and stores the sync token returned with the last page. Every later sync sends
+    that token and only receives the events created, changed or cancelled since, so repeated runs cost as much as the
+    changes rather than the calendar. If the server no longer accepts the token (410 Gone) the cache is rebuilt with a
+    full sync. The service only needs events().list(...).execute(), so a fake_calendar.FakeCalendarService can replace
+    the Google client.
+
+    Attributes
+    ----------
+    service : googleapiclient.discovery.Resource
+        the Calendar client (or a fake with the same events().list interface)
+    cache_path : str
+        path of the JSON file holding the cached events and sync token, nothing is stored on disk if None
+    calendar_id : str
+        calendar to read the events of
+    sync_token : str
+        token returned by the last sync, None before the first sync
+    events : dict
+        cached event (summary, start and end as ISO 8601 strings) for each event id
+
+    Methods
+    -------
+    sync()
+        Brings the cache up to date, fetching only the changes if possible
+    list_helper(sync_token)
+        Lists every page of events since a sync token and applies them to the cache
+    busy_blocks(date, tz)
+        Returns the merged busy intervals on a day
+    busy_tasks(date, tz)
+        Returns the busy intervals on a day as fixed-time task dictionaries
+    save()
+        Writes the cache to cache_path
+    """
+
+    def __init__(self, service, cache_path="busy_cache.json", calendar_id="primary"):
+        self.service = service
+        self.cache_path = cache_path
+        self.calendar_id = calendar_id
+        self.sync_token = None
+        self.events = {}
+
+        if cache_path is not None and os.path.exists(cache_path):
+            with open(cache_path) as cache:
+                cached = json.load(cache)
+            if cached.get("calendar_id") == calendar_id:
+                self.sync_token = cached["sync_token"]
+                self.events = cached["events"]
+
+    def sync(self):
+        """
+        Brings the cache up to date: an incremental sync with the stored token, or a full sync if there is no token
+        or the server rejected it
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        int
+            number of events received from the server
+
+        """
+        try:
+            received = self.list_helper(self.sync_token)
+        except Exception as error:
+            if self.sync_token is None or not is_sync_token_expired_helper(error):
+                raise
+            # the token expired, start over with a full sync
+            self.sync_token = None
+            self.events = {}
+            received = self.list_helper(None)
+
+        self.save()
+        return received
+
+    def list_helper(self, sync_token):
+        """
+        Lists every page of events since a sync token (all events if None) and applies them to the cache
+
+        Parameters
+        ----------
+        sync_token : str
+            token of the last sync, None for a full sync
+
+        Returns
+        ----------
+        int
+            number of events received from the server
+
+        """
+        received = 0
+        page_token = None
+        while True:
+            request = {"calendarId": self.calendar_id, "singleEvents": True, "showDeleted": sync_token is not None}
+            if sync_token is not None:
+                request["syncToken"] = sync_token
+            if page_token is not None:
+                request["pageToken"] = page_token
+            page = self.service.events().list(**request).execute()
+
+            for event in page.get('items', []):
+                received += 1
+                # cancelled, free (transparent) and all-day events do not block time
+                if event.get('status') == 'cancelled' or event.get('transparency') == 'transparent' \
+                        or 'dateTime' not in event.get('start', {}):
+                    self.events.pop(event['id'], None)
+                else:
+                    self.events[event['id']] = {"summary": event.get('summary', "busy"),
+                                                "start": event['start']['dateTime'],
+                                                "end": event['end']['dateTime']}
+
+            page_token = page.get('nextPageToken')
+            if page_token is None:
+                self.sync_token = page.get('nextSyncToken')
+                return received
+
+    def busy_blocks(self, date, tz=None):
+        """
+        Returns the cached events on a day as busy intervals, merging overlapping and adjacent events
+
+        Parameters
+        ----------
+        date : datetime.date
+            the day to plan
+        tz : datetime.tzinfo
+            time zone of the day, the events' own offsets if None (default None)
+
+        Returns
+        ----------
+        list[tuple]
+            (start in minutes, end in minutes, summaries) of each busy interval, in time order
+
+        """
+        intervals = []
+        for event in self.events.values():
+            start = datetime.datetime.fromisoformat(event["start"])
+            end = datetime.datetime.fromisoformat(event["end"])
+            if tz is not None:
+                start, end = start.astimezone(tz), end.astimezone(tz)
+            day_start = datetime.datetime.combine(date, datetime.time(), start.tzinfo)
+            # clip events that cross midnight to the day
+            start_minutes = max(0, (start - day_start).total_seconds() // 60)
+            end_minutes = min(24*60, (end - day_start).total_seconds() // 60)
+            if start_minutes < end_minutes:
+                intervals.append((int(start_minutes), int(end_minutes), event["summary"]))
+
+        blocks = []
+        for start, end, summary in sorted(intervals):
+            if blocks and start <= blocks[-1][1]:
+                blocks[-1] = (blocks[-1][0], max(blocks[-1][1], end), blocks[-1][2] + [summary])
+            else:
+                blocks.append((start, end, [summary]))
+
+        return blocks
+
+    def busy_tasks(self, date, tz=None):
+        """
+        Returns the busy intervals on a day as fixed-time task dictionaries (in the format of tasks.py),
+        to be passed to prepare_tasks with the rest of the tasks; they are marked busy, so they add no utility
+        and are not exported back to the calendar
+
+        Parameters
+        ----------
+        date : datetime.date
+            the day to plan
+        tz : datetime.tzinfo
+            time zone of the day, the events' own offsets if None (default None)
+
+        Returns
+        ----------
+        list[dict]
+            a fixed-time task with the id -(n+1) for the n-th busy interval
+
+        """
+        # negative ids never collide with the user's tasks, and are above the ids of recurring task occurrences
+        return [{'id': -(n+1), 'description': "busy: " + ", ".join(summaries),
+                 'duration': end - start, 'dependencies': [], 'busy': True,
+                 'time': start // 60 if start % 60 == 0 else start / 60}
+                for n, (start, end, summaries) in enumerate(self.busy_blocks(date, tz))]
+
+    def save(self):
+        """
+        Writes the cache to cache_path, replacing the previous cache in one step so a crash never leaves half a file
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        None
+
+        """
+        if self.cache_path is None:
+            return
+        with open(self.cache_path + ".tmp", "w") as cache:
+            json.dump({"calendar_id": self.calendar_id, "sync_token": self.sync_token,
+                       "events": self.events}, cache)
+        os.replace(self.cache_path + ".tmp", self.cache_path)
@@ -0,0 +1,289 @@
+class FakeHttpError(Exception):
+    """
+    Defining the FakeHttpError class, raised by FakeCalendarService where googleapiclient raises an HttpError
+
+    Attributes
+    ----------
+    resp : FakeResponse
+        the response, with its HTTP status
+    """
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.resp = FakeResponse(status)
+
+
+class FakeResponse:
+    """
+    Defining the FakeResponse class, the part of an HTTP response the importer looks at
+
+    Attributes
+    ----------
+    status : int
+        HTTP status code
+    """
+
+    def __init__(self, status):
+        self.status = status
+
+
+class FakeRequest:
+    """
+    Defining the FakeRequest class, a request whose result is computed when it is executed
+
+    Attributes
+    ----------
+    function : callable
+        computes the result of the request
+    kwargs : dict
+        keyword arguments passed on to function
+
+    Methods
+    -------
+    execute()
+        Returns the result of the request
+    """
+
+    def __init__(self, function, **kwargs):
+        self.function = function
+        self.kwargs = kwargs
+
+    def execute(self):
+        """
+        Returns the result of the request
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        dict
+            the response body
+
+        """
+        return self.function(**self.kwargs)
+
+
+class FakeCalendarService:
+    """
+    Defining the FakeCalendarService class, an in-memory stand-in for the Calendar API's events().list and
+    events().insert with paging and sync tokens, to run BusyTimeImporter and the calendar exports without a network.
+    A sync token is "generation:position", a position in the list of changes: listing with it returns the latest
+    version of every event changed since then, cancelled events included.
+
+    Attributes
+    ----------
+    events_by_id : dict
+        the current version of each event by id, cancelled events included
+    changes : list
+        id of the event changed by each edit, in order
+    page_size : int
+        maximum number of events per page
+    generation : int
+        sync tokens of earlier generations are rejected with 410 Gone, like expired tokens
+    list_calls : int
+        number of list requests served
+
+    Methods
+    -------
+    put_event(event)
+        Creates or changes an event
+    cancel_event(id)
+        Cancels an event
+    expire_tokens()
+        Makes every sync token issued so far invalid
+    events()
+        Returns the events collection
+    list(calendarId, syncToken, pageToken, showDeleted)
+        Returns a request for one page of events
+    insert(calendarId, body)
+        Returns a request creating an event
+    insert_helper(body)
+        Creates an event
+    list_helper(sync_token, page_token, show_deleted)
+        Returns one page of the events changed between two positions in the list of changes
+    """
+
+    def __init__(self, page_size=250):
+        self.events_by_id = {}
+        self.changes = []
+        self.page_size = page_size
+        self.generation = 0
+        self.list_calls = 0
+
+    def put_event(self, event):
+        """
+        Creates or changes an event
+
+        Parameters
+        ----------
+        event : dict
+            the event, in the Calendar API format, with its id
+
+        Returns
+        ----------
+        None
+
+        """
+        self.events_by_id[event['id']] = dict(event, status=event.get('status', 'confirmed'))
+        self.changes.append(event['id'])
+
+    def cancel_event(self, id):
+        """
+        Cancels an event
+
+        Parameters
+        ----------
+        id : str
+            id of the event
+
+        Returns
+        ----------
+        None
+
+        """
+        self.events_by_id[id] = {'id': id, 'status': 'cancelled'}
+        self.changes.append(id)
+
+    def expire_tokens(self):
+        """
+        Makes every sync token issued so far invalid, so the next incremental sync gets 410 Gone
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        None
+
+        """
+        self.generation += 1
+
+    def events(self):
+        """
+        Returns the events collection, which is the service itself
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        FakeCalendarService
+            the events collection
+
+        """
+        return self
+
+    def list(self, calendarId="primary", syncToken=None, pageToken=None, showDeleted=False, **kwargs):
+        """
+        Returns a request for one page of events, all events if there is no sync token
+
+        Parameters
+        ----------
+        calendarId : str
+            ignored, the fake has one calendar (default "primary")
+        syncToken : str
+            nextSyncToken of an earlier listing (default None)
+        pageToken : str
+            nextPageToken of the previous page (default None)
+        showDeleted : bool
+            whether a full listing includes cancelled events (default False)
+        **kwargs
+            other list parameters, ignored
+
+        Returns
+        ----------
+        FakeRequest
+            the request
+
+        """
+        return FakeRequest(self.list_helper, sync_token=syncToken, page_token=pageToken, show_deleted=showDeleted)
+
+    def insert(self, calendarId="primary", body=None, **kwargs):
+        """
+        Returns a request creating an event
+
+        Parameters
+        ----------
+        calendarId : str
+            ignored, the fake has one calendar (default "primary")
+        body : dict
+            the event, in the Calendar API format (default None)
+        **kwargs
+            other insert parameters, ignored
+
+        Returns
+        ----------
+        FakeRequest
+            the request, returning the event with its id
+
+        """
+        return FakeRequest(self.insert_helper, body=body)
+
+    def insert_helper(self, body):
+        """
+        Creates an event with the id given in body, or a new id if there is none; like the Calendar API, an id that is
+        already taken (even by a cancelled event) is rejected with 409 Conflict
+
+        Parameters
+        ----------
+        body : dict
+            the event, in the Calendar API format
+
+        Returns
+        ----------
+        dict
+            the created event
+
+        """
+        if body.get('id') in self.events_by_id:
+            raise FakeHttpError(409, "The requested identifier already exists.")
+        event = dict(body, id=body.get('id', f"event{len(self.changes)}"))
+        self.put_event(event)
+        return event
+
+    def list_helper(self, sync_token, page_token, show_deleted):
+        """
+        Returns one page of the events changed between two positions in the list of changes
+
+        Parameters
+        ----------
+        sync_token : str
+            "generation:position" the listing starts from, None for all events
+        page_token : str
+            "start:end:position" of the page, None for the first page
+        show_deleted : bool
+            whether a full listing includes cancelled events
+
+        Returns
+        ----------
+        dict
+            the events of the page, and either nextPageToken or nextSyncToken
+
+        """
+        self.list_calls += 1
+        if sync_token is not None:
+            generation, start = map(int, sync_token.split(":"))
+            if generation != self.generation:
+                raise FakeHttpError(410, "Sync token is no longer valid, a full sync is required.")
+
+        if page_token is None:
+            start, end, position = 0 if sync_token is None else start, len(self.changes), 0
+        else:
+            start, end, position = map(int, page_token.split(":"))
+
+        # latest version of every event changed in the listing, in the order of their last change
+        ids = list(dict.fromkeys(reversed(self.changes[start:end])))[::-1]
+        items = [self.events_by_id[id] for id in ids]
+        if sync_token is None and not show_deleted:
+            items = [event for event in items if event['status'] != 'cancelled']
+
+        page = {'items': items[position:position + self.page_size]}
+        if position + self.page_size < len(items):
+            page['nextPageToken'] = f"{start}:{end}:{position + self.page_size}"
+        else:
+            page['nextSyncToken'] = f"{self.generation}:{end}"
+        return page
@@ -0,0 +1,290 @@
+import random
+import time
+
+from prelim_classes import UTILITY_SCALE
+
+
+def improve_schedule(tasks_order, tasks, starting_time, time_period, max_iterations=1000, time_budget=None, seed=0):
+    """
+    Improves a schedule produced by the greedy scheduler with a local search over the free time around fixed-time tasks.
+    The schedule is split into gaps between fixed-time tasks and the search tries the following moves:
+    inserting an unscheduled task into a gap, swapping a scheduled task for an unscheduled one, replacing one scheduled task
+    with two shorter unscheduled ones and swapping two scheduled tasks between gaps to open up room.
+    Each move is evaluated in O(1) from the time used in each gap and the utilities of the tasks involved,
+    plus the dependencies of the tasks it moves: a move is only made if every scheduled flexible task it moves still has its
+    flexible dependencies scheduled in an earlier or the same gap.
+    The moves are drawn from a generator seeded with seed, so the same input always gives the same schedule
+    (unless time_budget cuts the search short).
+
+    Parameters
+    ----------
+    tasks_order : list[Task]
+        the order of the tasks returned by the greedy scheduler
+    tasks : list[Task]
+        all the tasks that were given to the scheduler
+    starting_time : int/float
+        time (in minutes) the scheduler started
+    time_period : int/float
+        time (in minutes) the scheduler can run for
+    max_iterations : int
+        maximum number of moves to try (default 1000)
+    time_budget : float
+        maximum number of seconds to search for, no limit if None (default None)
+    seed : int
+        seed for the random choice of moves (default 0)
+
+    Returns
+    ----------
+    lst, int
+        the improved order the tasks should be executed
+        and the total utility of the improved order
+
+    """
+    rng = random.Random(seed)
+    max_time = starting_time + time_period
+    deadline = None if time_budget is None else time.perf_counter() + time_budget
+
+    # split the schedule into gaps: the flexible tasks before each fixed-time task and after the last one
+    fixed_tasks = [task for task in tasks_order if task.time is not None]
+    gaps = [[]]
+    for task in tasks_order:
+        if task.time is not None:
+            gaps.append([])
+        else:
+            gaps[-1].append(task)
+
+    # free time available in each gap
+    capacities = []
+    gap_start = starting_time
+    for fixed_task in fixed_tasks:
+        capacities.append(min(fixed_task.time*60, max_time) - gap_start)
+        gap_start = fixed_task.time*60 + fixed_task.duration
+    capacities.append(max_time - gap_start)
+
+    # time already used in each gap; greedy may have overrun a gap, so never allow less than what is used
+    used = [sum(task.duration for task in gap) for gap in gaps]
+    capacities = [max(capacity, used[g]) for g, capacity in enumerate(capacities)]
+
+    # scheduled flexible tasks with the gap they are in, and unscheduled flexible tasks
+    scheduled = [task for gap in gaps for task in gap]
+    gap_of = {task: g for g, gap in enumerate(gaps) for task in gap}
+    scheduled_set = set(scheduled)
+    unscheduled = [task for task in tasks
+                   if task.time is None and task not in scheduled_set]
+
+    # utilities are computed once so every move is evaluated in O(1)
+    utilities = {task: task.scaled_utility() for task in scheduled + unscheduled}
+    # flexible dependencies and dependents of each flexible task
+    dependencies = {task: [dependency for dependency in set(task.dependencies) if dependency in utilities]
+                    for task in utilities}
+    dependents = {task: [] for task in utilities}
+    for task in utilities:
+        for dependency in dependencies[task]:
+            dependents[dependency].append(task)
+
+    def remove_helper(pool, i):
+        """
+        Helper function that removes the element at index i from a pool in O(1) by swapping it with the last element
+
+        Parameters
+        ----------
+        pool : list
+            list to remove the element from
+        i : int
+            index of the element to remove
+
+        Returns
+        ----------
+        any
+            the removed element
+
+        """
+        pool[i], pool[-1] = pool[-1], pool[i]
+        return pool.pop()
+
+    def schedule_helper(task, g):
+        """
+        Helper function that places an unscheduled task into gap g
+
+        Parameters
+        ----------
+        task : Task
+            task to place
+        g : int
+            index of the gap
+
+        Returns
+        ----------
+        None
+
+        """
+        scheduled.append(task)
+        gap_of[task] = g
+        used[g] += task.duration
+
+    def unschedule_helper(i):
+        """
+        Helper function that takes the scheduled task at index i out of its gap
+
+        Parameters
+        ----------
+        i : int
+            index of the task in scheduled
+
+        Returns
+        ----------
+        Task
+            the task that was taken out
+
+        """
+        task = remove_helper(scheduled, i)
+        used[gap_of.pop(task)] -= task.duration
+        return task
+
+    def dependencies_helper(changes):
+        """
+        Helper function that checks a move keeps the dependencies of the tasks it changes: each of them that is scheduled
+        must have its dependencies scheduled in an earlier or the same gap, and come no later than its scheduled dependents
+
+        Parameters
+        ----------
+        changes : dict
+            gap index (None for unscheduled) of each task the move changes
+
+        Returns
+        ----------
+        bool
+            whether the move is allowed
+
+        """
+        def gap_helper(task):
+            return changes[task] if task in changes else gap_of.get(task)
+
+        for task, g in changes.items():
+            for dependency in dependencies[task]:
+                if g is not None and (gap_helper(dependency) is None or gap_helper(dependency) > g):
+                    return False
+            for dependent in dependents[task]:
+                if gap_helper(dependent) is not None and (g is None or g > gap_helper(dependent)):
+                    return False
+        return True
+
+    def slack_helper(g):
+        """
+        Helper function that returns the free time left in gap g
+
+        Parameters
+        ----------
+        g : int
+            index of the gap
+
+        Returns
+        ----------
+        int/float
+            free time (in minutes) left in the gap
+
+        """
+        return capacities[g] - used[g]
+
+    for _ in range(max_iterations):
+        if deadline is not None and time.perf_counter() > deadline:
+            break
+
+        move = rng.randrange(4)
+
+        # insert an unscheduled task into a gap with enough free time
+        if move == 0 and unscheduled:
+            j = rng.randrange(len(unscheduled))
+            g = rng.randrange(len(gaps))
+            if unscheduled[j].duration <= slack_helper(g) and dependencies_helper({unscheduled[j]: g}):
+                schedule_helper(remove_helper(unscheduled, j), g)
+
+        # swap a scheduled task for a more useful unscheduled one
+        elif move == 1 and scheduled and unscheduled:
+            i = rng.randrange(len(scheduled))
+            j = rng.randrange(len(unscheduled))
+            old_task, new_task = scheduled[i], unscheduled[j]
+            g = gap_of[old_task]
+            if new_task.duration - old_task.duration <= slack_helper(g) \
+                    and utilities[new_task] > utilities[old_task] \
+                    and dependencies_helper({old_task: None, new_task: g}):
+                unschedule_helper(i)
+                remove_helper(unscheduled, j)
+                unscheduled.append(old_task)
+                schedule_helper(new_task, g)
+
+        # replace a scheduled task with two shorter unscheduled ones
+        elif move == 2 and scheduled and len(unscheduled) > 1:
+            i = rng.randrange(len(scheduled))
+            j, k = rng.sample(range(len(unscheduled)), 2)
+            old_task = scheduled[i]
+            first_task, second_task = unscheduled[j], unscheduled[k]
+            g = gap_of[old_task]
+            if first_task.duration + second_task.duration - old_task.duration <= slack_helper(g) \
+                    and utilities[first_task] + utilities[second_task] > utilities[old_task] \
+                    and dependencies_helper({old_task: None, first_task: g, second_task: g}):
+                unschedule_helper(i)
+                # remove the later index first so the earlier one stays valid
+                for index in sorted((j, k), reverse=True):
+                    remove_helper(unscheduled, index)
+                unscheduled.append(old_task)
+                schedule_helper(first_task, g)
+                schedule_helper(second_task, g)
+
+        # swap two scheduled tasks between gaps if it leaves a bigger block of free time
+        elif move == 3 and len(scheduled) > 1:
+            i, j = rng.sample(range(len(scheduled)), 2)
+            first_task, second_task = scheduled[i], scheduled[j]
+            g, h = gap_of[first_task], gap_of[second_task]
+            difference = second_task.duration - first_task.duration
+            if g != h and difference <= slack_helper(g) and -difference <= slack_helper(h) \
+                    and max(slack_helper(g) - difference, slack_helper(h) + difference) > max(slack_helper(g), slack_helper(h)) \
+                    and dependencies_helper({first_task: h, second_task: g}):
+                used[g] += difference
+                used[h] -= difference
+                gap_of[first_task], gap_of[second_task] = h, g
+
+    def gap_order_helper(gap):
+        """
+        Helper function that orders the tasks of a gap by priority, moving each task's dependencies in the gap before it
+
+        Parameters
+        ----------
+        gap : list[Task]
+            tasks of the gap
+
+        Returns
+        ----------
+        list[Task]
+            the tasks in the order they should be executed
+
+        """
+        in_gap = set(gap)
+        order, placed = [], set()
+
+        def place_helper(task):
+            if task in placed:
+                return
+            placed.add(task)
+            for dependency in sorted(dependencies[task], key=lambda task: task.unimportance()):
+                if dependency in in_gap:
+                    place_helper(dependency)
+            order.append(task)
+
+        for task in sorted(gap, key=lambda task: task.unimportance()):
+            place_helper(task)
+        return order
+
+    # rebuild the order: each gap's tasks by priority followed by the fixed-time task that closes it
+    gaps = [[] for _ in gaps]
+    for task in scheduled:
+        gaps[gap_of[task]].append(task)
+    improved_order = []
+    for g, gap in enumerate(gaps):
+        improved_order.extend(gap_order_helper(gap))
+        if g < len(fixed_tasks):
+            improved_order.append(fixed_tasks[g])
+
+    total_utility = sum([task.scaled_utility() for task in improved_order]) / UTILITY_SCALE
+
+    return improved_order, total_utility
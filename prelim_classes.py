@@ -1,3 +1,9 @@
+from bisect import bisect_right
+
+# utilities are compared and added as integer multiples of 1/UTILITY_SCALE, so every engine gets the same results
+UTILITY_SCALE = 10**6
+
+
 class Task:
 
     """
@@ -17,22 +23,42 @@ class Task:
         state of task: not started, in priority queue, or completed (default "N")
     time : int
         fixed time a task is to run if a fixed time exists (default None)
+    release : int
+        earliest time (in minutes) a task can start if it has a time window (default None)
+    deadline : int
+        time (in minutes) a task must be completed by if it has a time window (default None)
+    busy : bool
+        whether the task is a busy block imported from a calendar, which only reserves time (default False)
+    unimportance_score : float
+        priority value set by the scheduler's priority model, computed from the dependencies if None (default None)
+    utility_points : int
+        utility scaled by UTILITY_SCALE, set alongside unimportance_score, computed from utility() if None (default None)
 
     Methods
     -------
-    priority()
+    unimportance()
         returns the calculated priority value of a task instance
+    utility()
+        returns the utility of completing a task instance
+    scaled_utility()
+        returns the utility of completing a task instance as an integer number of 1/UTILITY_SCALE points
     __lt__(other: Task)
         determines if the task instance is less than the passed in task instance
     """
 
-    def __init__(self, id, description, duration, dependencies=[], status="N", time=None):
+    def __init__(self, id, description, duration, dependencies=[], status="N", time=None, release=None, deadline=None,
+                 busy=False):
         self.id = id
         self.description = description
         self.duration = duration
         self.dependencies = dependencies
         self.status = status
         self.time = time
+        self.release = release
+        self.deadline = deadline
+        self.busy = busy
+        self.unimportance_score = None
+        self.utility_points = None
 
     def unimportance(self):
         """
@@ -48,6 +74,9 @@ class Task:
           Priority value of task instance
 
         """
+        # priority value already computed by the scheduler's priority model
+        if self.unimportance_score is not None:
+            return self.unimportance_score
         # dummy Task instance for handling heappush to Minheap
         if self.description == 'dummy':
             return float('inf')
@@ -58,6 +87,48 @@ class Task:
 
         return unimportance_score
 
+    def utility(self):
+        """
+        Calculates the utility of completing a task instance
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        float
+          Utility of task instance (set by the scheduler's priority model, otherwise the inverse of its priority value),
+          0 for a busy block
+
+        """
+        # a busy block only reserves time, completing it is worth nothing
+        if self.busy:
+            return 0
+        # utility already computed by the scheduler's priority model
+        if self.utility_points is not None:
+            return self.utility_points / UTILITY_SCALE
+        return 1/self.unimportance()
+
+    def scaled_utility(self):
+        """
+        Calculates the utility of completing a task instance as an integer number of 1/UTILITY_SCALE points
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        int
+          Utility of task instance, scaled by UTILITY_SCALE and rounded
+
+        """
+        # points already computed by the scheduler's priority model
+        if self.utility_points is not None:
+            return self.utility_points
+        return round(self.utility()*UTILITY_SCALE)
+
     def __lt__(self, other):
         """
         Determines if the left operand is less than the right operand
@@ -74,10 +145,10 @@ class Task:
 
         """
         # for fixed-time tasks, tasks starting earlier would be at the top of the priority queue
-        if self.time and other.time:
+        if self.time is not None and other.time is not None:
             return self.time > other.time
         # for flexible time tasks, tasks with smaller priority values would be at the top of the priority queue
-        return 1/self.unimportance() < 1/other.unimportance()
+        return self.scaled_utility() < other.scaled_utility()
 
 
 class MaxHeapq:
@@ -296,3 +367,191 @@ class MaxHeapq:
             the heap size
         """
         return self.heap_size
+
+
+class DurationIndex:
+    """
+    Defining the DurationIndex class
+
+    Attributes
+    ----------
+    durations : list
+        sorted list of the distinct task durations, one bucket per duration
+    buckets : list[MaxHeapq]
+        a maximum heap per duration containing Task instances organized by priority
+    size : int
+        number of leaves in the segment tree (the number of buckets rounded up to a power of 2)
+    tree : list
+        segment tree over the buckets storing the index of the bucket with the highest priority task in each range
+    removed : set
+        Task instances that were discarded and are skipped when they reach the top of their bucket
+
+    Methods
+    -------
+    better_bucket(i, j)
+        Returns whichever of the two bucket indices has the highest priority task at the top
+    update(i)
+        Updates the segment tree after the top of bucket i changed
+    query(k)
+        Returns the index of the bucket with the highest priority task among the first k buckets
+    discard(task)
+        Marks a task as no longer available
+    pop_best_fit(max_duration, is_ready)
+        Returns the highest priority ready task that fits within max_duration and removes it from the index
+    __len__()
+        Returns the number of available tasks in the index
+    """
+
+    def __init__(self, tasks):
+        self.durations = sorted(set(task.duration for task in tasks))
+        self.buckets = [MaxHeapq() for _ in self.durations]
+        self.removed = set()
+        self.size = 1
+        while self.size < len(self.durations):
+            self.size *= 2
+        self.tree = [-1] * (2 * self.size)
+
+        positions = {duration: i for i, duration in enumerate(self.durations)}
+        for task in tasks:
+            self.buckets[positions[task.duration]].heappush(task)
+        for i in range(len(self.durations)):
+            self.update(i)
+
+    def better_bucket(self, i, j):
+        """
+        Returns whichever of the two bucket indices has the highest priority task at the top
+
+        Parameters
+        ----------
+        i: int
+            index of the first bucket, -1 if there is none
+        j: int
+            index of the second bucket, -1 if there is none
+
+        Returns
+        ----------
+        int
+            index of the bucket with the highest priority task, -1 if both are empty
+        """
+        if i == -1 or not self.buckets[i]:
+            return j if j != -1 and self.buckets[j] else -1
+        if j == -1 or not self.buckets[j]:
+            return i
+        return j if self.buckets[i].maxk() < self.buckets[j].maxk() else i
+
+    def update(self, i):
+        """
+        Updates the segment tree after the top of bucket i changed
+
+        Parameters
+        ----------
+        i: int
+            index of the bucket that changed
+
+        Returns
+        ----------
+        None
+        """
+        node = self.size + i
+        self.tree[node] = i if self.buckets[i] else -1
+        node //= 2
+        while node:
+            self.tree[node] = self.better_bucket(
+                self.tree[2 * node], self.tree[2 * node + 1])
+            node //= 2
+
+    def query(self, k):
+        """
+        Returns the index of the bucket with the highest priority task among the first k buckets
+
+        Parameters
+        ----------
+        k: int
+            number of buckets (from the shortest duration) to search
+
+        Returns
+        ----------
+        int
+            index of the best bucket, -1 if they are all empty
+        """
+        best = -1
+        left, right = self.size, self.size + k
+        while left < right:
+            if left % 2:
+                best = self.better_bucket(best, self.tree[left])
+                left += 1
+            if right % 2:
+                right -= 1
+                best = self.better_bucket(best, self.tree[right])
+            left //= 2
+            right //= 2
+        return best
+
+    def discard(self, task):
+        """
+        Marks a task as no longer available, it is removed lazily once it reaches the top of its bucket
+
+        Parameters
+        ----------
+        task: Task
+            task to discard
+
+        Returns
+        ----------
+        None
+        """
+        self.removed.add(task)
+
+    def pop_best_fit(self, max_duration, is_ready=None):
+        """
+        Returns the highest priority task that fits within max_duration and removes it from the index;
+        tasks that are not ready (e.g. whose dependencies are not completed yet) are passed over and kept in the index
+
+        Parameters
+        ----------
+        max_duration: int/float
+            the longest duration (in minutes) a task can have
+        is_ready: callable
+            returns whether a task can be run now, every task is ready if None (default None)
+
+        Returns
+        ----------
+        Task
+            the highest priority ready task that fits, None if no task fits
+        """
+        k = bisect_right(self.durations, max_duration)
+        best = None
+        passed_over = []
+        while best is None:
+            i = self.query(k)
+            if i == -1:
+                break
+            task = self.buckets[i].heappop()
+            self.update(i)
+            if task in self.removed:
+                self.removed.discard(task)
+            elif is_ready is None or is_ready(task):
+                best = task
+            else:
+                passed_over.append((i, task))
+
+        # put back the tasks that were not ready
+        for i, task in passed_over:
+            self.buckets[i].heappush(task)
+            self.update(i)
+        return best
+
+    def __len__(self):
+        """
+        Returns the number of available tasks in the index
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        int
+            the number of tasks that were not discarded
+        """
+        return sum(len(bucket) for bucket in self.buckets) - len(self.removed)
@@ -29,10 +29,15 @@ def prepare_tasks(tasks):
         dependencies = task['dependencies']
         # get the time for the fixed time tasks; assign time to None if it's a time-flexible task
         time = task.get('time', None)
+        # get the time window (in minutes) of the task if it has one
+        release = task.get('release', None)
+        deadline = task.get('deadline', None)
+        # whether the task is a busy block imported from a calendar
+        busy = task.get('busy', False)
 
         # transform the task into a task instance
         task_instances.append(
-            Task(id, description, duration, dependencies, time=time))
+            Task(id, description, duration, dependencies, time=time, release=release, deadline=deadline, busy=busy))
 
     def get_task_dependencies_helper(ids):
         """
@@ -49,17 +54,15 @@ def prepare_tasks(tasks):
           list of task instances corresponding to ids
 
         """
-        # stores list of task instances from the given ids
-        dependencies_instances = []
+        # positions of the task instances with the given ids, keeping the order of task_instances
+        positions = sorted(task_positions[id] for id in set(ids) if id in task_positions)
 
-        # for each task object in list to_do tasks
-        for task in task_instances:
-            # if the task id is in the given list of task ids
-            if task.id in ids:
-                # then that task object is the corresponding task instance for the id
-                dependencies_instances.append(task)
+        return [task_instances[position] for position in positions]
 
-        return dependencies_instances
+    # position of each task instance by id, so dependencies are looked up in O(1) instead of scanning all tasks
+    task_positions = {}
+    for position, task in enumerate(task_instances):
+        task_positions.setdefault(task.id, position)
 
     # for each task instance in to_do_tasks
     for task in task_instances:
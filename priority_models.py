@@ -0,0 +1,266 @@
+import abc
+
+import numpy as np
+
+
+class PriorityModel(abc.ABC):
+    """
+    Defining the PriorityModel class, the interface for computing the priorities of a whole task set at once
+
+    Methods
+    -------
+    unimportance(tasks)
+        Returns an array with the unimportance value of each task (smaller values are scheduled first)
+    utilities(tasks, scores)
+        Returns an array with the utility of each task, which the engines maximize
+    """
+
+    @abc.abstractmethod
+    def unimportance(self, tasks):
+        """
+        Returns an array with the unimportance value of each task (smaller values are scheduled first)
+
+        Parameters
+        ----------
+        tasks : list[Task]
+            tasks to compute the unimportance values of
+
+        Returns
+        ----------
+        numpy.ndarray
+            unimportance value of each task, in the same order as tasks
+
+        """
+
+    def utilities(self, tasks, scores=None):
+        """
+        Returns an array with the utility of each task, which the engines maximize; 1/unimportance unless overridden
+
+        Parameters
+        ----------
+        tasks : list[Task]
+            tasks to compute the utilities of
+        scores : numpy.ndarray
+            unimportance values of tasks if they were already computed, so they are not computed again (default None)
+
+        Returns
+        ----------
+        numpy.ndarray
+            utility of each task, in the same order as tasks
+
+        """
+        if scores is None:
+            scores = self.unimportance(tasks)
+        return 1/scores
+
+
+class DependencyPriorityModel(PriorityModel):
+    """
+    Defining the DependencyPriorityModel class, the default priority model:
+    number of dependencies + duration/60 + the unimportance values of each of the dependencies
+
+    Methods
+    -------
+    unimportance(tasks)
+        Returns an array with the unimportance value of each task, computed one dependency level at a time
+    """
+
+    def unimportance(self, tasks):
+        """
+        Returns an array with the unimportance value of each task, computed one dependency level at a time
+
+        Parameters
+        ----------
+        tasks : list[Task]
+            tasks to compute the unimportance values of
+
+        Returns
+        ----------
+        numpy.ndarray
+            unimportance value of each task, in the same order as tasks
+
+        """
+        # index every task, including dependencies that are not in tasks
+        index = {}
+        nodes = []
+        stack = list(tasks)
+        while stack:
+            task = stack.pop()
+            if task not in index:
+                index[task] = len(nodes)
+                nodes.append(task)
+                stack.extend(task.dependencies)
+
+        # dependency edges: the task at sources[e] depends on the task at targets[e]
+        sources = np.array([index[task] for task in nodes for _ in task.dependencies], dtype=np.int64)
+        targets = np.array([index[dependency] for task in nodes for dependency in task.dependencies], dtype=np.int64)
+
+        # own contribution of every task
+        durations = np.array([task.duration for task in nodes], dtype=np.float64)
+        counts = np.bincount(sources, minlength=len(nodes))
+        scores = counts + durations/60
+
+        # level of a task = length of its longest dependency chain, so dependencies always have smaller levels
+        levels = np.zeros(len(nodes), dtype=np.int64)
+        remaining = counts.copy()
+        dependents = [[] for _ in nodes]
+        for source, target in zip(sources.tolist(), targets.tolist()):
+            dependents[target].append(source)
+        frontier = [i for i in range(len(nodes)) if not remaining[i]]
+        while frontier:
+            next_frontier = []
+            for i in frontier:
+                for dependent in dependents[i]:
+                    levels[dependent] = max(levels[dependent], levels[i] + 1)
+                    remaining[dependent] -= 1
+                    if not remaining[dependent]:
+                        next_frontier.append(dependent)
+            frontier = next_frontier
+
+        # add the dependencies' values one level at a time
+        order = np.argsort(levels[sources], kind="stable")
+        sources, targets = sources[order], targets[order]
+        edge_levels = levels[sources]
+        for level in range(1, int(levels.max(initial=0)) + 1):
+            start, end = np.searchsorted(edge_levels, [level, level + 1])
+            np.add.at(scores, sources[start:end], scores[targets[start:end]])
+
+        # dummy tasks used by the heaps are never important
+        dummies = np.array([task.description == 'dummy' for task in nodes], dtype=bool)
+        scores[dummies] = np.inf
+
+        return scores[[index[task] for task in tasks]]
+
+
+class WeightedPriorityModel(PriorityModel):
+    """
+    Defining the WeightedPriorityModel class, which scales another model by user-provided weights
+
+    Attributes
+    ----------
+    weights : dict
+        weight of each task id, tasks with larger weights are more important (default weight 1)
+    base_model : PriorityModel
+        model whose unimportance values are scaled (default DependencyPriorityModel)
+
+    Methods
+    -------
+    unimportance(tasks)
+        Returns an array with the unimportance value of each task divided by its weight
+    """
+
+    def __init__(self, weights, base_model=None):
+        self.weights = weights
+        self.base_model = base_model or DependencyPriorityModel()
+
+    def unimportance(self, tasks):
+        """
+        Returns an array with the unimportance value of each task divided by its weight
+
+        Parameters
+        ----------
+        tasks : list[Task]
+            tasks to compute the unimportance values of
+
+        Returns
+        ----------
+        numpy.ndarray
+            unimportance value of each task, in the same order as tasks
+
+        """
+        weights = np.array([self.weights.get(task.id, 1)
+                           for task in tasks], dtype=np.float64)
+        return self.base_model.unimportance(tasks)/weights
+
+
+class CachedPriorityModel(PriorityModel):
+    """
+    Defining the CachedPriorityModel class, which remembers the values of another model for the last task set it was given
+
+    Attributes
+    ----------
+    base_model : PriorityModel
+        model whose unimportance values are cached (default DependencyPriorityModel)
+    cached_tasks : tuple
+        the task set the cached values belong to
+    cached_scores : numpy.ndarray
+        the cached unimportance values
+    cached_utilities : numpy.ndarray
+        the cached utilities, None until they are asked for
+
+    Methods
+    -------
+    unimportance(tasks)
+        Returns the cached unimportance values if tasks is the cached task set, otherwise computes and caches them
+    utilities(tasks, scores)
+        Returns the cached utilities of the base model if tasks is the cached task set, otherwise computes and caches them
+    clear()
+        Forgets the cached values, e.g. after the tasks' durations or dependencies changed
+    """
+
+    def __init__(self, base_model=None):
+        self.base_model = base_model or DependencyPriorityModel()
+        self.cached_tasks = None
+        self.cached_scores = None
+        self.cached_utilities = None
+
+    def unimportance(self, tasks):
+        """
+        Returns the cached unimportance values if tasks is the cached task set, otherwise computes and caches them
+
+        Parameters
+        ----------
+        tasks : list[Task]
+            tasks to compute the unimportance values of
+
+        Returns
+        ----------
+        numpy.ndarray
+            unimportance value of each task, in the same order as tasks
+
+        """
+        tasks = tuple(tasks)
+        if tasks != self.cached_tasks:
+            self.cached_scores = self.base_model.unimportance(tasks)
+            self.cached_utilities = None
+            self.cached_tasks = tasks
+        return self.cached_scores
+
+    def utilities(self, tasks, scores=None):
+        """
+        Returns the cached utilities of the base model if tasks is the cached task set, otherwise computes and caches them
+
+        Parameters
+        ----------
+        tasks : list[Task]
+            tasks to compute the utilities of
+        scores : numpy.ndarray
+            ignored, the cached unimportance values are used (default None)
+
+        Returns
+        ----------
+        numpy.ndarray
+            utility of each task, in the same order as tasks
+
+        """
+        self.unimportance(tasks)
+        if self.cached_utilities is None:
+            self.cached_utilities = self.base_model.utilities(self.cached_tasks, self.cached_scores)
+        return self.cached_utilities
+
+    def clear(self):
+        """
+        Forgets the cached values, e.g. after the tasks' durations or dependencies changed
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        None
+
+        """
+        self.cached_tasks = None
+        self.cached_scores = None
+        self.cached_utilities = None
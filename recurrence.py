@@ -0,0 +1,166 @@
+import heapq
+import math
+
+# recurrence intervals in minutes
+HOURLY = 60
+DAILY = 24*60
+WEEKLY = 7*24*60
+
+# occurrences get negative ids, so they never collide with the non-negative ids of the user's tasks,
+# below -OCCURRENCE_ID_BASE so they never collide with busy blocks either (see busy_time.py)
+OCCURRENCE_ID_BASE = 2**40
+MAX_OCCURRENCES = 2**20
+
+
+def occurrence_id(id, k):
+    """
+    Returns the id of the k-th occurrence of a recurring task, an integer the task store and snapshots can hold
+
+    Parameters
+    ----------
+    id : int
+        non-negative id of the recurring task
+    k : int
+        occurrence number
+
+    Returns
+    ----------
+    int
+        id of the occurrence
+
+    """
+    if k >= MAX_OCCURRENCES:
+        raise ValueError(f"task {id} has more than {MAX_OCCURRENCES} occurrences")
+    return -(OCCURRENCE_ID_BASE + id*MAX_OCCURRENCES + k)
+
+
+def occurrence_start_helper(task):
+    """
+    Helper function that returns the time (in minutes) of the first occurrence of a recurring task:
+    its 'start' if given, otherwise its fixed time, otherwise 0
+
+    Parameters
+    ----------
+    task : dict
+        a recurring task dictionary
+
+    Returns
+    ----------
+    int/float
+        time (in minutes) of the first occurrence
+
+    """
+    recurrence = task['recurrence']
+    if 'start' in recurrence:
+        return recurrence['start']
+    return task['time']*60 if task.get('time', None) is not None else 0
+
+
+def occurrences_helper(task, window_start, window_end):
+    """
+    Helper function that lazily yields the occurrences of one recurring task within a planning window, in time order
+
+    Parameters
+    ----------
+    task : dict
+        a recurring task dictionary
+    window_start : int/float
+        start (in minutes) of the planning window
+    window_end : int/float
+        end (in minutes) of the planning window
+
+    Returns
+    ----------
+    generator
+        (occurrence time in minutes, occurrence number, task dictionary) for each occurrence
+
+    """
+    recurrence = task['recurrence']
+    interval = recurrence['interval']
+    first = occurrence_start_helper(task)
+    end = min(window_end, recurrence.get('until', float('inf')))
+
+    k = max(0, math.ceil((window_start - first) / interval))
+    while first + k*interval < end:
+        yield first + k*interval, k, task
+        k += 1
+
+
+def expand_recurring_tasks(tasks, window_start, window_end):
+    """
+    Lazily expands recurring tasks into one task dictionary per occurrence within a planning window.
+    A recurring task carries a 'recurrence' dictionary with an 'interval' in minutes (e.g. DAILY, WEEKLY or n*HOURLY),
+    and optionally the 'start' (in minutes) of its first occurrence and the time it repeats 'until'.
+    Non-recurring tasks are passed through as they are. Occurrences get the id occurrence_id(id, occurrence number),
+    fixed-time occurrences are shifted by the interval, flexible occurrences are released at their occurrence time and
+    due by the next occurrence (or the time the task repeats until), and a dependency on a recurring task refers to that task's latest occurrence
+    at or before the dependent occurrence (dropped if it falls before the window, as it is assumed done).
+
+    Parameters
+    ----------
+    tasks : list[dict]
+        a list of dictionaries with each dictionary containing necessary data for the Task class
+    window_start : int/float
+        start (in minutes) of the planning window
+    window_end : int/float
+        end (in minutes) of the planning window
+
+    Returns
+    ----------
+    generator
+        task dictionaries ready for prepare_tasks, recurring occurrences in time order after the non-recurring tasks
+
+    """
+    recurring = {task['id']: task for task in tasks if task.get('recurrence')}
+
+    for task in tasks:
+        if task['id'] not in recurring:
+            # a non-recurring task cannot refer to a single occurrence, so its dependencies on recurring tasks are dropped
+            # by prepare_tasks
+            yield task
+
+    def dependency_helper(dependency, time):
+        """
+        Helper function that returns the id of the occurrence a dependency refers to
+
+        Parameters
+        ----------
+        dependency : int
+            id of the dependency
+        time : int/float
+            time (in minutes) of the dependent occurrence
+
+        Returns
+        ----------
+        int
+            id of the dependency occurrence, None if it falls before the window
+
+        """
+        if dependency not in recurring:
+            return dependency
+        dependency_task = recurring[dependency]
+        interval = dependency_task['recurrence']['interval']
+        first = occurrence_start_helper(dependency_task)
+        k = math.floor((time - first) / interval)
+        # the dependency may have stopped repeating before this occurrence
+        if 'until' in dependency_task['recurrence']:
+            k = min(k, math.ceil((dependency_task['recurrence']['until'] - first) / interval) - 1)
+        if k < 0 or first + k*interval < window_start:
+            return None
+        return occurrence_id(dependency, k)
+
+    for time, k, task in heapq.merge(*[occurrences_helper(task, window_start, window_end) for task in recurring.values()],
+                                     key=lambda occurrence: occurrence[:2]):
+        occurrence = {key: value for key, value in task.items()
+                      if key != 'recurrence'}
+        occurrence['id'] = occurrence_id(task['id'], k)
+        occurrence['dependencies'] = [dependency_id for dependency_id in
+                                      (dependency_helper(dependency, time) for dependency in task['dependencies'])
+                                      if dependency_id is not None]
+        if task.get('time', None) is not None:
+            occurrence['time'] = time // 60 if time % 60 == 0 else time / 60
+        else:
+            occurrence['release'] = time
+            occurrence['deadline'] = min(time + task['recurrence']['interval'],
+                                         task['recurrence'].get('until', float('inf')))
+        yield occurrence
@@ -0,0 +1,309 @@
+import queue
+import threading
+import time
+
+from taskscheduler import TaskScheduler
+from prepare_tasks import prepare_tasks
+
+# marks the end of the mutations in the queue
+CLOSE = object()
+
+
+def apply_mutations_helper(task_dicts, batch):
+    """
+    Returns a copy of a task set with a batch of mutations applied, leaving the original and its dictionaries untouched:
+    only the dictionaries of updated tasks are copied, the others are shared
+
+    Parameters
+    ----------
+    task_dicts : dict
+        task dictionary (in the format of tasks.py) for each task id
+    batch : list[tuple]
+        (op, task id, data) for each mutation, in the order they were submitted
+
+    Returns
+    ----------
+    dict
+        task dictionary for each task id after the mutations
+
+    """
+    task_dicts = dict(task_dicts)
+    for op, id, data in batch:
+        if op == "add":
+            task_dicts[id] = data
+        elif op == "update":
+            # an update of a task removed earlier in the burst is dropped
+            if id in task_dicts:
+                task_dicts[id] = {**task_dicts[id], **data}
+        elif op == "remove":
+            task_dicts.pop(id, None)
+    return task_dicts
+
+
+class RescheduleQueue:
+    """
+    Defining the RescheduleQueue class, a front-end that accepts task mutations from any number of threads or coroutines
+    and coalesces them into reschedules. A background worker waits for the first mutation of a burst, keeps collecting
+    mutations for the debounce window, applies the whole burst as one batch to a copy of the task set and runs a single
+    reschedule on freshly built Task instances, so no scheduler run ever shares statuses or heaps with another.
+    The result is published by swapping one reference: readers take schedule without any lock and always see
+    a complete schedule, never a partially applied burst. Completed tasks are removed rather than updated,
+    since every reschedule plans the whole task set.
+
+    Attributes
+    ----------
+    task_dicts : dict
+        task dictionary (in the format of tasks.py) for each task id, replaced (never modified) by the worker
+        once a burst has been rescheduled successfully
+    engine : str
+        a name from TaskScheduler.ENGINES or "auto"
+    starting_time : int/float
+        time (in minutes) to start task scheduler
+    debounce : float
+        seconds to keep collecting mutations after the first one of a burst
+    options : dict
+        keyword arguments passed on to the engine
+    schedule : dict
+        the last published schedule: its version, the sequence number of the last mutation it includes,
+        the scheduled tasks with their start times and the total utility; must not be modified by readers
+    error : Exception
+        error raised by the last reschedule, None if it succeeded (default None)
+    mutations : queue.Queue
+        mutations waiting for the worker
+    sequence : int
+        sequence number of the last submitted mutation
+    sequence_lock : threading.Lock
+        makes numbering and queueing a mutation atomic, so mutations are queued in sequence order
+    published : threading.Condition
+        notified every time a burst has been processed
+    worker : threading.Thread
+        thread that applies the mutations and runs the reschedules
+
+    Methods
+    -------
+    add(task)
+        Adds a task, or replaces the task with the same id
+    update(id, **changes)
+        Changes some fields of a task, e.g. its duration, time or dependencies
+    remove(id)
+        Removes a task
+    submit(op, id, data)
+        Queues one mutation and returns its sequence number
+    wait(sequence, timeout)
+        Blocks until a schedule including a mutation is published
+    run()
+        Applies the queued mutations in bursts until the queue is closed
+    reschedule(task_dicts, sequence)
+        Runs the scheduler on a task set and publishes the result, returns whether it succeeded
+    close()
+        Processes the remaining mutations and stops the worker
+    """
+
+    def __init__(self, tasks, engine="auto", starting_time=4*60, debounce=0.05, **options):
+        self.task_dicts = {task['id']: task for task in tasks}
+        self.engine = engine
+        self.starting_time = starting_time
+        self.debounce = debounce
+        self.options = options
+        self.schedule = None
+        self.error = None
+        self.mutations = queue.Queue()
+        self.sequence = 0
+        self.sequence_lock = threading.Lock()
+        self.published = threading.Condition()
+
+        self.reschedule(self.task_dicts, 0)
+        self.worker = threading.Thread(target=self.run, daemon=True)
+        self.worker.start()
+
+    def add(self, task):
+        """
+        Adds a task, or replaces the task with the same id
+
+        Parameters
+        ----------
+        task : dict
+            dictionary containing necessary data for the Task class
+
+        Returns
+        ----------
+        int
+            sequence number of the mutation
+
+        """
+        return self.submit("add", task['id'], dict(task))
+
+    def update(self, id, **changes):
+        """
+        Changes some fields of a task, e.g. its duration, time or dependencies
+
+        Parameters
+        ----------
+        id : int
+            id of the task
+        **changes
+            new values of the task's fields
+
+        Returns
+        ----------
+        int
+            sequence number of the mutation
+
+        """
+        return self.submit("update", id, changes)
+
+    def remove(self, id):
+        """
+        Removes a task
+
+        Parameters
+        ----------
+        id : int
+            id of the task
+
+        Returns
+        ----------
+        int
+            sequence number of the mutation
+
+        """
+        return self.submit("remove", id, None)
+
+    def submit(self, op, id, data):
+        """
+        Queues one mutation without waiting for it to be applied, so it can be called from an event loop
+
+        Parameters
+        ----------
+        op : str
+            "add", "update" or "remove"
+        id : int
+            id of the task
+        data : dict
+            the task for "add", the changed fields for "update", None for "remove"
+
+        Returns
+        ----------
+        int
+            sequence number of the mutation, to pass to wait
+
+        """
+        if op not in ("add", "update", "remove"):
+            raise ValueError(f"unknown op '{op}'")
+        with self.sequence_lock:
+            self.sequence += 1
+            self.mutations.put((self.sequence, (op, id, data)))
+            return self.sequence
+
+    def wait(self, sequence=None, timeout=None):
+        """
+        Blocks until a schedule including a mutation is published
+
+        Parameters
+        ----------
+        sequence : int
+            sequence number of the mutation, the last submitted mutation if None (default None)
+        timeout : float
+            maximum number of seconds to wait, forever if None (default None)
+
+        Returns
+        ----------
+        dict
+            the published schedule, None if the timeout expired first
+
+        """
+        sequence = self.sequence if sequence is None else sequence
+        with self.published:
+            if not self.published.wait_for(lambda: self.schedule["sequence"] >= sequence, timeout):
+                return None
+            return self.schedule
+
+    def run(self):
+        """
+        Applies the queued mutations in bursts until the queue is closed: a burst starts with the first mutation
+        after a reschedule and includes every mutation submitted within the debounce window
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        None
+
+        """
+        closed = False
+        while not closed:
+            item = self.mutations.get()
+            if item is CLOSE:
+                return
+            sequence, mutation = item
+            batch = [mutation]
+
+            deadline = time.monotonic() + self.debounce
+            while True:
+                try:
+                    item = self.mutations.get(timeout=max(0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is CLOSE:
+                    closed = True
+                    break
+                sequence, mutation = item
+                batch.append(mutation)
+
+            # a burst whose reschedule fails is dropped, so one bad mutation does not break every later burst
+            task_dicts = apply_mutations_helper(self.task_dicts, batch)
+            if self.reschedule(task_dicts, sequence):
+                self.task_dicts = task_dicts
+
+    def reschedule(self, task_dicts, sequence):
+        """
+        Runs the scheduler on new Task instances built from a task set and publishes the result;
+        if the run fails, the previous schedule stays published and the error is kept
+
+        Parameters
+        ----------
+        task_dicts : dict
+            task dictionary for each task id
+        sequence : int
+            sequence number of the last mutation included in the task set
+
+        Returns
+        ----------
+        bool
+            whether the run succeeded
+
+        """
+        schedule = self.schedule
+        try:
+            scheduler = TaskScheduler(prepare_tasks(list(task_dicts.values())))
+            result = scheduler.schedule_slots(self.starting_time, self.engine, **self.options)
+            version = schedule["version"] + 1 if schedule else 0
+            schedule = {"version": version, "sequence": sequence, **result}
+            self.error = None
+        except Exception as error:
+            self.error = error
+            schedule = {**(schedule or {"version": 0, "tasks": [], "utility": 0}), "sequence": sequence}
+
+        with self.published:
+            # a single reference swap, readers see either the old or the new schedule
+            self.schedule = schedule
+            self.published.notify_all()
+        return self.error is None
+
+    def close(self):
+        """
+        Processes the remaining mutations and stops the worker
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        None
+
+        """
+        self.mutations.put(CLOSE)
+        self.worker.join()
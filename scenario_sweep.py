@@ -0,0 +1,131 @@
+import itertools
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from taskscheduler import TaskScheduler
+from priority_models import CachedPriorityModel
+from task_snapshot import TaskSnapshot, write_snapshot
+
+# state of each worker process, set once by init_worker_helper
+worker_tasks = None
+worker_priority_model = None
+
+
+def init_worker_helper(snapshot_path):
+    """
+    Helper function that loads the shared task table once in a worker process
+
+    Parameters
+    ----------
+    snapshot_path : str
+        path of the task snapshot every worker maps
+
+    Returns
+    ----------
+    None
+
+    """
+    global worker_tasks, worker_priority_model
+    snapshot = TaskSnapshot(snapshot_path)
+    worker_tasks = snapshot.to_tasks()
+    snapshot.close()
+    worker_priority_model = CachedPriorityModel()
+
+
+def makespan_helper(tasks_order, starting_time):
+    """
+    Helper function that returns how long a schedule takes, with fixed-time tasks starting no earlier than their fixed time
+
+    Parameters
+    ----------
+    tasks_order : list[Task]
+        the order the tasks should be executed
+    starting_time : int/float
+        time (in minutes) the scheduler started
+
+    Returns
+    ----------
+    int/float
+        time (in minutes) from the start until the last task is completed
+
+    """
+    current_time = starting_time
+    for task in tasks_order:
+        if task.time is not None:
+            current_time = max(current_time, task.time*60)
+        current_time += task.duration
+    return current_time - starting_time
+
+
+def run_scenario_helper(scenario):
+    """
+    Helper function that runs one (starting time, horizon, engine) scenario on the worker's tasks
+
+    Parameters
+    ----------
+    scenario : tuple
+        (starting time in minutes, horizon in minutes, engine name)
+
+    Returns
+    ----------
+    tuple(float, float)
+        the total utility and the makespan of the scenario
+
+    """
+    starting_time, horizon, engine = scenario
+    # scheduler runs only change the statuses, so resetting them is enough to reuse the tasks
+    for task in worker_tasks:
+        task.status = TaskScheduler.NOT_STARTED
+    scheduler = TaskScheduler(worker_tasks, worker_priority_model)
+    scheduler.time_period = horizon
+    tasks_order, total_utility = scheduler.run_task_scheduler(
+        starting_time, engine, will_print=False)
+    return total_utility, makespan_helper(tasks_order, starting_time)
+
+
+def sweep_scenarios(tasks, starting_times, horizons, engines=("greedy", "dp"), processes=None):
+    """
+    Evaluates every (starting time, horizon, engine) scenario against one task table.
+    The table is written once as a task snapshot that every worker process maps,
+    so no scenario copies the tasks.
+
+    Parameters
+    ----------
+    tasks : list[dict]
+        a list of dictionaries with each dictionary containing necessary data for the Task class
+    starting_times : list[int/float]
+        times (in minutes) to start the task scheduler
+    horizons : list[int/float]
+        times (in minutes) the task scheduler can run for
+    engines : list[str]
+        engines to compare, names from TaskScheduler.ENGINES or "auto" (default ("greedy", "dp"))
+    processes : int
+        number of worker processes (default None, one per CPU)
+
+    Returns
+    ----------
+    numpy.ndarray, numpy.ndarray
+        the total utility and the makespan of each scenario,
+        both of shape (len(starting_times), len(horizons), len(engines))
+
+    """
+    for engine in engines:
+        if engine != "auto" and engine not in TaskScheduler.ENGINES:
+            raise ValueError(f"unknown engine '{engine}'")
+
+    scenarios = list(itertools.product(starting_times, horizons, engines))
+    with tempfile.TemporaryDirectory() as directory:
+        snapshot_path = os.path.join(directory, "tasks.snap")
+        write_snapshot(snapshot_path, tasks)
+        with ProcessPoolExecutor(processes, initializer=init_worker_helper, initargs=(snapshot_path,)) as executor:
+            results = list(executor.map(run_scenario_helper, scenarios,
+                                        chunksize=max(1, len(scenarios) // (4*(processes or os.cpu_count() or 1)))))
+
+    shape = (len(starting_times), len(horizons), len(engines))
+    utilities = np.array([utility for utility, _ in results]).reshape(shape)
+    makespans = np.array([makespan for _, makespan in results]).reshape(shape)
+
+    return utilities, makespans
@@ -0,0 +1,87 @@
+import queue
+import threading
+
+# marks the end of a stream in the queue
+END_OF_STREAM = object()
+
+
+def stream_in_background(stream, maxsize=16):
+    """
+    Runs a schedule stream (e.g. TaskScheduler.greedy_stream_task_scheduler) in a background thread and yields its slots,
+    so the consumer's I/O (calendar export, file writes, progress output) overlaps with the rest of the computation.
+    At most maxsize slots are buffered: once the buffer is full the engine waits for the consumer to catch up.
+
+    Parameters
+    ----------
+    stream : generator
+        the schedule stream to run
+    maxsize : int
+        maximum number of slots computed ahead of the consumer (default 16)
+
+    Returns
+    ----------
+    generator
+        the slots of the stream, in order; errors raised by the stream are raised again in the consumer
+
+    """
+    slots = queue.Queue(maxsize)
+    stopped = threading.Event()
+
+    def put_helper(item):
+        """
+        Helper function that waits for room in the queue and puts an item in it, giving up if the consumer went away
+
+        Parameters
+        ----------
+        item : tuple
+            (slot, error) to put in the queue
+
+        Returns
+        ----------
+        bool
+            whether the item was put in the queue
+
+        """
+        while not stopped.is_set():
+            try:
+                slots.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def producer_helper():
+        """
+        Helper function that runs the stream and puts its slots in the queue until it ends or the consumer stops
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        None
+
+        """
+        try:
+            for slot in stream:
+                if not put_helper((slot, None)):
+                    return
+        except Exception as error:
+            put_helper((END_OF_STREAM, error))
+            return
+        put_helper((END_OF_STREAM, None))
+
+    producer = threading.Thread(target=producer_helper, daemon=True)
+    producer.start()
+    try:
+        while True:
+            slot, error = slots.get()
+            if slot is END_OF_STREAM:
+                if error is not None:
+                    raise error
+                return
+            yield slot
+    finally:
+        stopped.set()
+        producer.join()
@@ -0,0 +1,327 @@
+import argparse
+import asyncio
+import json
+
+from taskscheduler import TaskScheduler
+from batch_run import event_body_helper
+from prepare_tasks import prepare_tasks
+from priority_models import CachedPriorityModel
+from tasks import somtos_tasks
+
+SCOPES = ['https://www.googleapis.com/auth/calendar']
+# longest request line (in bytes) the daemon reads, large enough for a few hundred thousand tasks
+LINE_LIMIT = 64*2**20
+
+
+class SchedulerDaemon:
+    """
+    Defining the SchedulerDaemon class, a long-running service that keeps task sets, their priorities
+    and the Calendar client warm and serves scheduler runs over a local socket.
+
+    Requests and responses are one JSON object per line. Supported requests:
+    {"op": "load", "name": str, "tasks": list[dict]}
+        parses and stores a task set (in the format of tasks.py)
+    {"op": "schedule", "name": str, "engine": str, "starting_time": int, "options": dict}
+        runs the scheduler on a stored task set; options are passed on to the engine
+    {"op": "export", "name": str, "engine": str, "starting_time": int, "date": "YYYY-MM-DD"}
+        runs the scheduler and inserts the scheduled tasks into the primary Google Calendar
+    {"op": "ping"}
+        checks the daemon is up
+
+    Attributes
+    ----------
+    task_sets : dict
+        parsed Task instances for each task set name
+    priority_models : dict
+        a CachedPriorityModel for each task set name, so priorities are only computed when a task set is loaded
+    token_path : str
+        path to the stored Google credentials
+    service : googleapiclient.discovery.Resource
+        the Calendar client, built on the first export (default None)
+    lock : asyncio.Lock
+        serializes scheduler runs, since they mutate the tasks' statuses
+    line_limit : int
+        longest request line (in bytes) the servers read, longer requests get an error response (default LINE_LIMIT)
+
+    Methods
+    -------
+    load(name, tasks)
+        Parses and stores a task set
+    schedule(name, engine, starting_time, options)
+        Runs a scheduler engine on a stored task set
+    calendar_service()
+        Returns the Calendar client, building it on first use
+    export(name, engine, starting_time, date)
+        Runs a scheduler engine and inserts the scheduled tasks into the primary calendar
+    insert_events(tasks, date)
+        Inserts scheduled tasks into the primary calendar
+    handle_request(request)
+        Dispatches one request and returns its response
+    handle_connection(reader, writer)
+        Serves the requests sent over one connection
+    """
+
+    def __init__(self, token_path='token.json', line_limit=LINE_LIMIT):
+        self.task_sets = {}
+        self.priority_models = {}
+        self.token_path = token_path
+        self.service = None
+        self.lock = asyncio.Lock()
+        self.line_limit = line_limit
+
+    def load(self, name, tasks):
+        """
+        Parses and stores a task set, replacing any task set with the same name
+
+        Parameters
+        ----------
+        name : str
+            name of the task set
+        tasks : list[dict]
+            a list of dictionaries with each dictionary containing necessary data for the Task class
+
+        Returns
+        ----------
+        dict
+            the number of tasks loaded
+
+        """
+        self.task_sets[name] = prepare_tasks(tasks)
+        self.priority_models[name] = CachedPriorityModel()
+        return {"tasks": len(self.task_sets[name])}
+
+    def schedule(self, name, engine="greedy", starting_time=4*60, options=None):
+        """
+        Runs a scheduler engine on a stored task set
+
+        Parameters
+        ----------
+        name : str
+            name of the task set
+        engine : str
+            a name from TaskScheduler.ENGINES or "auto" (default "greedy")
+        starting_time : int/float
+            time (in minutes) to start task scheduler (default 4*60)
+        options : dict
+            keyword arguments passed on to the engine (default None)
+
+        Returns
+        ----------
+        dict
+            the scheduled tasks with their start times and the total utility
+
+        """
+        tasks = self.task_sets[name]
+        # every run starts from a clean state
+        for task in tasks:
+            task.status = TaskScheduler.NOT_STARTED
+        scheduler = TaskScheduler(tasks, self.priority_models[name])
+        response = scheduler.schedule_slots(starting_time, engine, **(options or {}))
+        if scheduler.engine_choice:
+            response["engine_choice"] = scheduler.engine_choice
+        return response
+
+    def calendar_service(self):
+        """
+        Returns the Calendar client, building it from the stored credentials on first use
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        googleapiclient.discovery.Resource
+            the Calendar client
+
+        """
+        if self.service is None:
+            from googleapiclient.discovery import build
+            from google.oauth2.credentials import Credentials
+
+            creds = Credentials.from_authorized_user_file(
+                self.token_path, SCOPES)
+            self.service = build('calendar', 'v3', credentials=creds)
+        return self.service
+
+    def export(self, name, engine="dp", starting_time=4*60, date="2023-03-18"):
+        """
+        Runs a scheduler engine and inserts the scheduled tasks into the primary calendar
+
+        Parameters
+        ----------
+        name : str
+            name of the task set
+        engine : str
+            a name from TaskScheduler.ENGINES or "auto" (default "dp")
+        starting_time : int/float
+            time (in minutes) to start task scheduler (default 4*60)
+        date : str
+            day of the events, as YYYY-MM-DD (default "2023-03-18")
+
+        Returns
+        ----------
+        dict
+            the ids of the created events
+
+        """
+        return self.insert_events(self.schedule(name, engine, starting_time)["tasks"], date)
+
+    def insert_events(self, tasks, date="2023-03-18"):
+        """
+        Inserts scheduled tasks into the primary calendar, except busy blocks which come from a calendar already;
+        only uses the Calendar client, so it can run without the lock
+
+        Parameters
+        ----------
+        tasks : list[dict]
+            the scheduled tasks with their start times, as returned by schedule
+        date : str
+            day of the events, as YYYY-MM-DD (default "2023-03-18")
+
+        Returns
+        ----------
+        dict
+            the ids of the created events
+
+        """
+        service = self.calendar_service()
+        event_ids = []
+        tasks = [task for task in tasks if not task.get("busy", False)]
+        for id, task in enumerate(tasks):
+            event = service.events().insert(calendarId='primary', body=event_body_helper(task, id, date)).execute()
+            event_ids.append(event.get('id'))
+
+        return {"events": event_ids}
+
+    async def handle_request(self, request):
+        """
+        Dispatches one request and returns its response
+
+        Parameters
+        ----------
+        request : dict
+            the decoded request
+
+        Returns
+        ----------
+        dict
+            the response, with "ok" set to whether the request succeeded
+
+        """
+        try:
+            if not isinstance(request, dict):
+                raise ValueError("a request must be a JSON object")
+            op = request.get("op")
+            if op == "ping":
+                return {"ok": True}
+            async with self.lock:
+                if op == "load":
+                    result = self.load(request["name"], request["tasks"])
+                elif op in ("schedule", "export"):
+                    default_engine = "greedy" if op == "schedule" else "dp"
+                    result = self.schedule(request["name"], request.get("engine", default_engine),
+                                           request.get("starting_time", 4*60), request.get("options"))
+                else:
+                    raise ValueError(f"unknown op '{op}'")
+            if op == "export":
+                # calendar requests block on the network, so they run off the event loop and without the lock
+                result = await asyncio.get_running_loop().run_in_executor(
+                    None, self.insert_events, result["tasks"], request.get("date", "2023-03-18"))
+        except Exception as error:
+            return {"ok": False, "error": f"{type(error).__name__}: {error}"}
+
+        return {"ok": True, **result}
+
+    async def handle_connection(self, reader, writer):
+        """
+        Serves the requests sent over one connection, one JSON object per line, until the client disconnects
+
+        Parameters
+        ----------
+        reader : asyncio.StreamReader
+            stream of requests
+        writer : asyncio.StreamWriter
+            stream of responses
+
+        Returns
+        ----------
+        None
+
+        """
+        async def read_line_helper():
+            """
+            Helper function that reads the next line, skipping the whole line if it is longer than the reader's limit
+
+            Parameters
+            ----------
+            None
+
+            Returns
+            ----------
+            bytes
+                the line, None if it was too long, b"" once the client disconnected
+
+            """
+            too_long = False
+            while True:
+                try:
+                    line = await reader.readuntil(b"\n")
+                    return None if too_long else line
+                except asyncio.IncompleteReadError as error:
+                    return b"" if too_long else error.partial
+                except asyncio.LimitOverrunError as error:
+                    # drop what was read of the line and keep looking for its end
+                    too_long = True
+                    await reader.readexactly(error.consumed)
+
+        try:
+            while (line := await read_line_helper()) != b"":
+                if line is None:
+                    response = {"ok": False, "error": f"request longer than {self.line_limit} bytes"}
+                else:
+                    try:
+                        response = await self.handle_request(json.loads(line))
+                    except json.JSONDecodeError as error:
+                        response = {"ok": False, "error": f"invalid JSON: {error}"}
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        finally:
+            writer.close()
+
+
+async def serve(socket_path=None, port=None, line_limit=LINE_LIMIT):
+    """
+    Starts the daemon on a Unix socket, or on localhost if a port is given, with Somto's tasks preloaded
+
+    Parameters
+    ----------
+    socket_path : str
+        path of the Unix socket (default None)
+    port : int
+        localhost port to listen on instead of a Unix socket (default None)
+    line_limit : int
+        longest request line (in bytes) to read (default LINE_LIMIT)
+
+    Returns
+    ----------
+    None
+
+    """
+    daemon = SchedulerDaemon(line_limit=line_limit)
+    daemon.load("somto", somtos_tasks)
+    if port is not None:
+        server = await asyncio.start_server(daemon.handle_connection, '127.0.0.1', port, limit=daemon.line_limit)
+    else:
+        server = await asyncio.start_unix_server(daemon.handle_connection, socket_path, limit=daemon.line_limit)
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Run the scheduler daemon")
+    parser.add_argument("--socket", default="/tmp/taskscheduler.sock")
+    parser.add_argument("--port", type=int)
+    parser.add_argument("--line-limit", type=int, default=LINE_LIMIT)
+    args = parser.parse_args()
+    asyncio.run(serve(args.socket, args.port, args.line_limit))
@@ -0,0 +1,98 @@
+import argparse
+import asyncio
+import json
+import time
+
+
+async def client_helper(connect, requests, engine, starting_time, latencies):
+    """
+    Sends schedule requests one after another over a single connection and records their latencies
+
+    Parameters
+    ----------
+    connect : callable
+        coroutine function opening a connection to the daemon
+    requests : int
+        number of requests to send
+    engine : str
+        scheduler engine to request
+    starting_time : int
+        time (in minutes) to start task scheduler
+    latencies : list
+        list the latency (in seconds) of each request is appended to
+
+    Returns
+    ----------
+    None
+
+    """
+    reader, writer = await connect()
+    request = json.dumps({"op": "schedule", "name": "somto",
+                         "engine": engine, "starting_time": starting_time}).encode() + b"\n"
+    for _ in range(requests):
+        start = time.perf_counter()
+        writer.write(request)
+        await writer.drain()
+        response = json.loads(await reader.readline())
+        latencies.append(time.perf_counter() - start)
+        if not response["ok"]:
+            raise RuntimeError(response["error"])
+    writer.close()
+    await writer.wait_closed()
+
+
+async def load_test(socket_path=None, port=None, clients=10, requests=100, engine="greedy", starting_time=4*60):
+    """
+    Runs concurrent clients against the scheduler daemon and prints the throughput and latency percentiles
+
+    Parameters
+    ----------
+    socket_path : str
+        path of the daemon's Unix socket (default None)
+    port : int
+        localhost port of the daemon, used instead of the Unix socket if given (default None)
+    clients : int
+        number of concurrent connections (default 10)
+    requests : int
+        number of requests per connection (default 100)
+    engine : str
+        scheduler engine to request (default "greedy")
+    starting_time : int
+        time (in minutes) to start task scheduler (default 4*60)
+
+    Returns
+    ----------
+    list
+        the sorted latencies (in seconds) of all requests
+
+    """
+    if port is not None:
+        def connect(): return asyncio.open_connection('127.0.0.1', port)
+    else:
+        def connect(): return asyncio.open_unix_connection(socket_path)
+
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*[client_helper(connect, requests, engine, starting_time, latencies)
+                           for _ in range(clients)])
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print(f"{len(latencies)} requests in {elapsed:.2f}s ({len(latencies)/elapsed:.0f} requests/s)")
+    for percentile in (50, 90, 99):
+        index = min(len(latencies) - 1, len(latencies) * percentile // 100)
+        print(f"p{percentile}: {latencies[index]*1000:.2f}ms")
+
+    return latencies
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Load test the scheduler daemon")
+    parser.add_argument("--socket", default="/tmp/taskscheduler.sock")
+    parser.add_argument("--port", type=int)
+    parser.add_argument("--clients", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--engine", default="greedy")
+    args = parser.parse_args()
+    asyncio.run(load_test(args.socket, args.port,
+                args.clients, args.requests, args.engine))
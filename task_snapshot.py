@@ -0,0 +1,290 @@
+import mmap
+import struct
+
+import numpy as np
+
+from prelim_classes import Task
+
+# file layout: header (magic, version, reserved, number of tasks, number of dependencies, string table size),
+# then 8-byte aligned sections in the order of SECTIONS
+MAGIC = b"TSKSNAP\0"
+VERSION = 2
+HEADER = struct.Struct("<8sIIQQQ")
+SECTIONS = [
+    ("ids", np.int64),
+    ("durations", np.int64),
+    ("times", np.float64),
+    ("releases", np.float64),
+    ("deadlines", np.float64),
+    ("statuses", np.uint8),
+    ("description_offsets", np.int64),
+    ("dependency_offsets", np.int64),
+    ("dependency_indices", np.int64),
+    ("strings", np.uint8),
+]
+
+
+def section_lengths_helper(n, edges, string_bytes):
+    """
+    Returns the number of elements in each section of a snapshot
+
+    Parameters
+    ----------
+    n : int
+        number of tasks
+    edges : int
+        number of dependencies
+    string_bytes : int
+        size of the string table in bytes
+
+    Returns
+    ----------
+    list
+        number of elements in each section, in the order of SECTIONS
+
+    """
+    return [n, n, n, n, n, n, n + 1, n + 1, edges, string_bytes]
+
+
+def write_snapshot(path, tasks):
+    """
+    Writes a list of task dictionaries (in the format of tasks.py) to a binary snapshot file.
+    Tasks are stored as fixed-width columns, dependencies as a CSR array of row indices
+    and descriptions as offsets into a UTF-8 string table. Like prepare_tasks, dependencies on ids that are not
+    in tasks are dropped and each dependency is kept once, in the order of tasks.
+
+    Parameters
+    ----------
+    path : str
+        path of the snapshot file
+    tasks : list[dict]
+        a list of dictionaries with each dictionary containing necessary data for the Task class
+
+    Returns
+    ----------
+    None
+
+    """
+    # row of each task by id, the first task with an id wins like in prepare_tasks
+    rows = {}
+    for row, task in enumerate(tasks):
+        rows.setdefault(task['id'], row)
+    dependency_rows = [sorted({rows[dependency] for dependency in task['dependencies'] if dependency in rows})
+                       for task in tasks]
+
+    encoded = [task['description'].encode() for task in tasks]
+    description_offsets = np.zeros(len(tasks) + 1, dtype=np.int64)
+    np.cumsum([len(description) for description in encoded], out=description_offsets[1:])
+
+    dependency_offsets = np.zeros(len(tasks) + 1, dtype=np.int64)
+    np.cumsum([len(dependencies) for dependencies in dependency_rows], out=dependency_offsets[1:])
+
+    columns = [
+        np.array([task['id'] for task in tasks], dtype=np.int64),
+        np.array([task['duration'] for task in tasks], dtype=np.int64),
+        np.array([np.nan if task.get('time', None) is None else task['time']
+                 for task in tasks], dtype=np.float64),
+        np.array([np.nan if task.get('release', None) is None else task['release']
+                 for task in tasks], dtype=np.float64),
+        np.array([np.nan if task.get('deadline', None) is None else task['deadline']
+                 for task in tasks], dtype=np.float64),
+        np.frombuffer(b"".join(task.get('status', "N").encode() for task in tasks), dtype=np.uint8),
+        description_offsets,
+        dependency_offsets,
+        np.array([row for dependencies in dependency_rows for row in dependencies], dtype=np.int64),
+        np.frombuffer(b"".join(encoded), dtype=np.uint8),
+    ]
+
+    with open(path, "wb") as snapshot:
+        snapshot.write(HEADER.pack(MAGIC, VERSION, 0, len(tasks),
+                       int(dependency_offsets[-1]), int(description_offsets[-1])))
+        for column in columns:
+            snapshot.write(column.tobytes())
+            snapshot.write(b"\0" * (-column.nbytes % 8))
+
+
+class TaskSnapshot:
+    """
+    Defining the TaskSnapshot class, a zero-copy view over a memory-mapped snapshot file.
+    The section arrays and the arrays returned by dependencies are views into the memory map, so they are only valid
+    until close; the Task instances built by to_tasks hold no views and outlive the snapshot.
+
+    Attributes
+    ----------
+    mmap : mmap.mmap
+        the memory-mapped snapshot file
+    ids : numpy.ndarray
+        id of each task
+    durations : numpy.ndarray
+        duration (in minutes) of each task
+    times : numpy.ndarray
+        fixed time of each task, NaN for flexible-time tasks
+    releases : numpy.ndarray
+        release time (in minutes) of each task, NaN if it has none
+    deadlines : numpy.ndarray
+        deadline (in minutes) of each task, NaN if it has none
+    statuses : numpy.ndarray
+        status character code of each task
+    description_offsets : numpy.ndarray
+        start of each task's description in the string table, followed by the end of the table
+    dependency_offsets : numpy.ndarray
+        start of each task's dependencies in dependency_indices, followed by the number of dependencies
+    dependency_indices : numpy.ndarray
+        row indices of the dependencies of every task
+    strings : numpy.ndarray
+        the UTF-8 string table
+
+    Methods
+    -------
+    description(row)
+        Returns the description of the task at a row
+    dependencies(row)
+        Returns the row indices of the dependencies of the task at a row
+    to_tasks(rows)
+        Builds Task instances for the given rows
+    close()
+        Closes the memory map
+    __len__()
+        Returns the number of tasks in the snapshot
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as snapshot:
+            self.mmap = mmap.mmap(snapshot.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, _, n, edges, string_bytes = HEADER.unpack_from(self.mmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f"'{path}' is not a task snapshot")
+        if version != VERSION:
+            raise ValueError(f"unsupported task snapshot version {version}")
+
+        # map every section without copying it
+        offset = HEADER.size
+        for (name, dtype), count in zip(SECTIONS, section_lengths_helper(n, edges, string_bytes)):
+            column = np.frombuffer(self.mmap, dtype=dtype, count=count, offset=offset)
+            setattr(self, name, column)
+            offset += column.nbytes + (-column.nbytes % 8)
+
+    def description(self, row):
+        """
+        Returns the description of the task at a row
+
+        Parameters
+        ----------
+        row : int
+            row of the task
+
+        Returns
+        ----------
+        str
+            description of the task
+
+        """
+        start, end = self.description_offsets[row], self.description_offsets[row + 1]
+        return self.strings[start:end].tobytes().decode()
+
+    def dependencies(self, row):
+        """
+        Returns the row indices of the dependencies of the task at a row
+
+        Parameters
+        ----------
+        row : int
+            row of the task
+
+        Returns
+        ----------
+        numpy.ndarray
+            row indices of the dependencies
+
+        """
+        return self.dependency_indices[self.dependency_offsets[row]:self.dependency_offsets[row + 1]]
+
+    def to_tasks(self, rows=None):
+        """
+        Builds Task instances for the given rows, keeping only dependencies within those rows;
+        every value is copied out of the memory map, so the tasks stay valid after close
+
+        Parameters
+        ----------
+        rows : list[int]
+            rows of the tasks to build, all tasks if None (default None)
+
+        Returns
+        ----------
+        list
+            a list of Task objects
+
+        """
+        def value_helper(column, row):
+            """
+            Helper function that reads a float column at a row, as an int if it is whole
+
+            Parameters
+            ----------
+            column : numpy.ndarray
+                a float section
+            row : int
+                row of the task
+
+            Returns
+            ----------
+            int/float
+                the value, None if it is NaN
+
+            """
+            value = column[row].item()
+            if np.isnan(value):
+                return None
+            return int(value) if value == int(value) else value
+
+        rows = range(len(self)) if rows is None else rows
+        tasks = {}
+        for row in rows:
+            tasks[row] = Task(int(self.ids[row]), self.description(row), int(self.durations[row]),
+                              status=chr(self.statuses[row]), time=value_helper(self.times, row),
+                              release=value_helper(self.releases, row), deadline=value_helper(self.deadlines, row))
+        dependency_offsets = self.dependency_offsets.tolist()
+        for row, task in tasks.items():
+            dependencies = self.dependency_indices[dependency_offsets[row]:dependency_offsets[row + 1]].tolist()
+            task.dependencies = [tasks[dependency] for dependency in dependencies if dependency in tasks]
+
+        return list(tasks.values())
+
+    def close(self):
+        """
+        Closes the memory map, the section arrays must not be used afterwards. If views taken from the snapshot
+        (e.g. the result of dependencies) are still alive, the memory map cannot be closed yet and is left to be
+        closed by the garbage collector once they are released
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        None
+
+        """
+        for name, _ in SECTIONS:
+            setattr(self, name, None)
+        try:
+            self.mmap.close()
+        except BufferError:
+            # views are still exported, the map is closed when the last one is released
+            pass
+
+    def __len__(self):
+        """
+        Returns the number of tasks in the snapshot
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        int
+            the number of tasks
+        """
+        return len(self.ids)
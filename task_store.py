@@ -0,0 +1,195 @@
+import sqlite3
+
+from prepare_tasks import prepare_tasks
+
+
+class TaskStore:
+    """
+    Defining the TaskStore class, a SQLite-backed persistent store of tasks
+
+    Attributes
+    ----------
+    connection : sqlite3.Connection
+        connection to the SQLite database
+    batch_size : int
+        number of rows written per transaction when saving statuses
+
+    Methods
+    -------
+    add_tasks(tasks, owner)
+        Stores a list of task dictionaries for an owner
+    load_tasks(owner, starting_time, time_period)
+        Returns Task instances for the owner's not started tasks that can run within the horizon
+    save_statuses(tasks, owner)
+        Writes the tasks' statuses back to the store in batched transactions
+    close()
+        Closes the connection to the database
+    """
+    NOT_STARTED = "N"
+    COMPLETED = "C"
+
+    def __init__(self, path=":memory:", batch_size=500):
+        self.connection = sqlite3.connect(path)
+        self.batch_size = batch_size
+        with self.connection:
+            self.connection.executescript("""
+                CREATE TABLE IF NOT EXISTS tasks (
+                    owner TEXT NOT NULL,
+                    id INTEGER NOT NULL,
+                    description TEXT NOT NULL,
+                    duration INTEGER NOT NULL,
+                    time REAL,
+                    status TEXT NOT NULL DEFAULT 'N',
+                    release REAL,
+                    deadline REAL,
+                    PRIMARY KEY (owner, id)
+                );
+                CREATE TABLE IF NOT EXISTS dependencies (
+                    owner TEXT NOT NULL,
+                    task_id INTEGER NOT NULL,
+                    dependency_id INTEGER NOT NULL,
+                    PRIMARY KEY (owner, task_id, dependency_id)
+                );
+                CREATE INDEX IF NOT EXISTS tasks_owner_status_time ON tasks (owner, status, time);
+                CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status);
+                CREATE INDEX IF NOT EXISTS tasks_time ON tasks (time);
+            """)
+            # stores created before tasks had time windows
+            columns = {row[1] for row in self.connection.execute("PRAGMA table_info(tasks)")}
+            for column in ("release", "deadline"):
+                if column not in columns:
+                    self.connection.execute(f"ALTER TABLE tasks ADD COLUMN {column} REAL")
+
+    def add_tasks(self, tasks, owner="default"):
+        """
+        Stores a list of task dictionaries (in the format of tasks.py) for an owner, replacing tasks with the same ids
+
+        Parameters
+        ----------
+        tasks : list[dict]
+            a list of dictionaries with each dictionary containing necessary data for the Task class
+        owner : str
+            owner of the tasks (default "default")
+
+        Returns
+        ----------
+        None
+
+        """
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO tasks (owner, id, description, duration, time, status, release, deadline) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(owner, task['id'], task['description'], task['duration'], task.get('time', None), task.get('status', self.NOT_STARTED),
+                  task.get('release', None), task.get('deadline', None))
+                 for task in tasks])
+            # a replaced task keeps only its new dependencies
+            self.connection.executemany(
+                "DELETE FROM dependencies WHERE owner = ? AND task_id = ?",
+                [(owner, task['id']) for task in tasks])
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO dependencies (owner, task_id, dependency_id) VALUES (?, ?, ?)",
+                [(owner, task['id'], dependency) for task in tasks for dependency in task['dependencies']])
+
+    def load_tasks(self, owner="default", starting_time=0, time_period=7*60):
+        """
+        Returns Task instances for the owner's not started tasks that are flexible or have a fixed time within the horizon.
+        Dependencies on completed (or unknown) tasks are dropped; a task that depends on an unfinished task that is not
+        loaded (e.g. one with a fixed time after the horizon) is left out, along with every task that depends on it.
+
+        Parameters
+        ----------
+        owner : str
+            owner of the tasks (default "default")
+        starting_time : int/float
+            time (in minutes) the scheduler will start (default 0)
+        time_period : int/float
+            time (in minutes) the scheduler will run for (default 7*60)
+
+        Returns
+        ----------
+        list
+            a list of Task objects ready to be given to a TaskScheduler
+
+        """
+        rows = self.connection.execute(
+            """SELECT id, description, duration, time, release, deadline FROM tasks
+               WHERE owner = ? AND status = ? AND (time IS NULL OR (time >= ? AND time < ?))""",
+            (owner, self.NOT_STARTED, starting_time/60, (starting_time + time_period)/60)).fetchall()
+
+        dependencies = {row[0]: [] for row in rows}
+        dependents = {row[0]: [] for row in rows}
+        blocked = []
+        for task_id, dependency_id, status in self.connection.execute(
+                """SELECT d.task_id, d.dependency_id, t.status FROM dependencies d
+                   LEFT JOIN tasks t ON t.owner = d.owner AND t.id = d.dependency_id
+                   WHERE d.owner = ?""", (owner,)):
+            if task_id not in dependencies or status is None or status == self.COMPLETED:
+                continue
+            if dependency_id in dependencies:
+                dependencies[task_id].append(dependency_id)
+                dependents[dependency_id].append(task_id)
+            else:
+                # the task has to wait for a task that is not loaded
+                blocked.append(task_id)
+
+        # the tasks that depend on a blocked task are blocked too
+        blocked = set(blocked)
+        stack = list(blocked)
+        while stack:
+            for dependent in dependents[stack.pop()]:
+                if dependent not in blocked:
+                    blocked.add(dependent)
+                    stack.append(dependent)
+
+        tasks = []
+        for id, description, duration, time, release, deadline in rows:
+            if id in blocked:
+                continue
+            task = {'id': id, 'description': description,
+                    'duration': duration, 'dependencies': dependencies[id]}
+            for key, value in (('time', time), ('release', release), ('deadline', deadline)):
+                if value is not None:
+                    task[key] = int(value) if value == int(value) else value
+            tasks.append(task)
+
+        return prepare_tasks(tasks)
+
+    def save_statuses(self, tasks, owner="default"):
+        """
+        Writes the tasks' statuses back to the store in batched transactions.
+        A run of the scheduler only completes tasks, so tasks left in a priority queue or cut off by the end of the horizon
+        are stored as not started again.
+
+        Parameters
+        ----------
+        tasks : list[Task]
+            tasks whose statuses should be saved
+        owner : str
+            owner of the tasks (default "default")
+
+        Returns
+        ----------
+        None
+
+        """
+        updates = [(self.COMPLETED if task.status == self.COMPLETED else self.NOT_STARTED, owner, task.id)
+                   for task in tasks]
+        for start in range(0, len(updates), self.batch_size):
+            with self.connection:
+                self.connection.executemany(
+                    "UPDATE tasks SET status = ? WHERE owner = ? AND id = ?", updates[start:start + self.batch_size])
+
+    def close(self):
+        """
+        Closes the connection to the database
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        None
+
+        """
+        self.connection.close()
@@ -1,4 +1,10 @@
-from prelim_classes import MaxHeapq
+import heapq
+import math
+from functools import reduce
+
+from prelim_classes import MaxHeapq, DurationIndex, UTILITY_SCALE
+from local_search import improve_schedule
+from priority_models import DependencyPriorityModel
 
 
 class TaskScheduler:
@@ -13,28 +19,75 @@ class TaskScheduler:
         a maximum heap containing Task instances with no fixed execution times organized by priority
     fixed_time_priority_queue : MinHeapq[Tasks]
         a maximum heap containing Task instances with fixed execution times organized by starting time
+    priority_model : PriorityModel
+        model that computes the priority values of all the tasks at once (default DependencyPriorityModel)
+    engine_choice : dict
+        the engine picked by the last automatic engine selection, the cost estimates and the reason (default None)
+    slots : list[tuple]
+        (task, start time, end time) of each task run by the last single-lane engine, fixed-time tasks included (default [])
 
     Methods
     -------
     print_self()
         Nicely prints out task descriptions and durations in the task sceduler and their respective dependencies if any
+    apply_priority_model()
+        Computes the priority values of all the tasks with the priority model and caches them on the tasks
     get_tasks_ready()
         Populates flexible_time_priority_queue and fixed_time_prioruty queues with flexible-time tasks and fixed_time tasks respectively
+    dependency_graph()
+        Returns the dependencies within the task scheduler, the tasks depending on each task and a topological order
+    compute_slack(starting_time)
+        Computes the earliest start, latest start and slack of every task relative to the fixed-time tasks
     format_time(time)
         Returns a string representation of the time in the day from the time (in minutes) given
-    run_task_scheduler(starting_time)
-        Runs the tasks in the task scheduler in order of priorities (for flexible-time tasks) and starting times (for fixed-time tasks)
+    estimate_engine_costs()
+        Estimates the running time (in seconds) of each engine on the tasks in the task scheduler
+    choose_engine(latency_budget)
+        Picks the best-quality engine whose estimated running time fits within the latency budget
+    run_task_scheduler(starting_time, engine)
+        Runs the tasks in the task scheduler with the given engine, or with an automatically chosen one
+    schedule_slots(starting_time, engine)
+        Runs an engine and returns the scheduled tasks with the start times the engine gave them
+    greedy_stream_task_scheduler(starting_time)
+        Runs the greedy approach as a generator yielding each scheduled slot as soon as it is committed
+    deadline_run_task_scheduler(starting_time)
+        Runs the tasks within their release times and deadlines in earliest-deadline-first order, rejecting the fewest tasks
+    beam_run_task_scheduler(starting_time, beam_width, depth)
+        Runs the tasks with a beam search over partial schedules, looking depth steps ahead
+    multi_lane_run_task_scheduler(starting_time, workers)
+        Assigns the tasks to several parallel workers with list scheduling
     """
     NOT_STARTED = "N"
     IN_PRIOIRITY_QUEUE = "I"
     IN_PROGRESS = "P"
     COMPLETED = "C"
 
-    def __init__(self, tasks):
+    # engine name -> (method, keyword arguments), from the best to the worst quality
+    ENGINES = {
+        "pareto": ("dp_run_task_scheduler", {"solver": "pareto"}),
+        "dp": ("dp_run_task_scheduler", {}),
+        "beam": ("beam_run_task_scheduler", {}),
+        "greedy_improve": ("greedy_run_task_scheduler", {"fill_gaps": True, "improve": True}),
+        "greedy_fill": ("greedy_run_task_scheduler", {"fill_gaps": True}),
+        "greedy": ("greedy_run_task_scheduler", {}),
+        "deadline": ("deadline_run_task_scheduler", {}),
+    }
+    # approximate seconds per unit of work, measured on the pure Python engines
+    PRIORITY_COST = 2e-6
+    HEAP_COST = 2e-6
+    DP_CELL_COST = 2.5e-6
+    PARETO_STATE_COST = 2e-6
+    BEAM_STATE_COST = 5e-6
+    LOCAL_SEARCH_MOVE_COST = 3e-6
+
+    def __init__(self, tasks, priority_model=None):
         self.tasks = tasks
         self.time_period = 7*60
         self.flexible_time_priority_queue = MaxHeapq()
         self.fixed_time_priority_queue = MaxHeapq()
+        self.priority_model = priority_model or DependencyPriorityModel()
+        self.engine_choice = None
+        self.slots = []
 
     def print_self(self):
         """
@@ -61,6 +114,31 @@ class TaskScheduler:
                         f"\t\t->⛔️'{dependency.description}', duration = {dependency.duration} minutes.")
                 print()
 
+    def apply_priority_model(self):
+        """
+        Computes the priority values and the utilities of all the tasks with the priority model and caches them
+        on the tasks, the utilities scaled to integers, so heap comparisons and utilities do not recompute them
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        None
+
+        """
+        for task in self.tasks:
+            task.unimportance_score = None
+            task.utility_points = None
+        # the utilities are derived from the same unimportance values, so the model only runs once
+        scores = self.priority_model.unimportance(self.tasks)
+        utilities = self.priority_model.utilities(self.tasks, scores).tolist()
+        for task, score, utility in zip(self.tasks, scores.tolist(), utilities):
+            task.unimportance_score = score
+            # a busy block only reserves time
+            task.utility_points = 0 if task.busy else round(UTILITY_SCALE*utility)
+
     def get_tasks_ready(self):
         """
         Populates flexible_time_priority_queue and fixed_time_prioruty queues with flexible-time tasks and fixed_time tasks respectively
@@ -74,9 +152,10 @@ class TaskScheduler:
         None
 
         """
+        self.apply_priority_model()
         for task in self.tasks:
             if task.status != 'I':
-                if not task.time:
+                if task.time is None:
                     self.flexible_time_priority_queue.heappush(task)
                 else:
                     self.fixed_time_priority_queue.heappush(task)
@@ -95,6 +174,85 @@ class TaskScheduler:
         assert ([flexible_task.time for flexible_task in self.flexible_time_priority_queue.heap] == [
                 None]*len(self.flexible_time_priority_queue))
 
+    def dependency_graph(self):
+        """
+        Returns the dependencies of each task that are in the task scheduler, the tasks that depend on each task
+        and a topological order of the tasks (dependencies first), in O(V+E)
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        dict, dict, list
+            the dependencies and the dependents of each task, and the tasks in topological order
+
+        """
+        task_set = set(self.tasks)
+        dependencies = {task: [dependency for dependency in task.dependencies if dependency in task_set]
+                        for task in self.tasks}
+        remaining = {task: len(dependencies[task]) for task in self.tasks}
+        dependents = {task: [] for task in self.tasks}
+        for task in self.tasks:
+            for dependency in dependencies[task]:
+                dependents[dependency].append(task)
+
+        order = [task for task in self.tasks if not remaining[task]]
+        for task in order:
+            for dependent in dependents[task]:
+                remaining[dependent] -= 1
+                if not remaining[dependent]:
+                    order.append(dependent)
+        if len(order) < len(self.tasks):
+            raise ValueError("task dependencies contain a cycle")
+
+        return dependencies, dependents, order
+
+    def compute_slack(self, starting_time):
+        """
+        Computes the earliest start, latest start and slack of every task in O(V+E).
+        The earliest start follows the dependency chains forward from the starting time (fixed-time tasks start no earlier than their time).
+        The latest start follows them backward from the fixed-time tasks: a task must start early enough for every
+        chain through it to finish before the fixed-time task it leads to. Tasks that lead to no fixed-time task have infinite
+        latest start and slack, and a negative slack means the fixed-time task can no longer be met.
+
+        Parameters
+        ----------
+        starting_time : int/float
+            time (in minutes) to start task scheduler
+
+        Returns
+        ----------
+        dict, dict, dict
+            the earliest start, latest start and slack (in minutes) of each task
+
+        """
+        dependencies, dependents, order = self.dependency_graph()
+
+        # forward pass: a task starts once all its dependencies are completed
+        earliest_start = {}
+        for task in order:
+            start = max([starting_time] + [earliest_start[dependency] + dependency.duration
+                                           for dependency in dependencies[task]])
+            if task.time is not None:
+                start = max(start, task.time*60)
+            earliest_start[task] = start
+
+        # backward pass: a task must be completed before any of its dependents has to start
+        latest_start = {}
+        for task in reversed(order):
+            latest = min([float('inf')] + [latest_start[dependent]
+                                           for dependent in dependents[task]]) - task.duration
+            if task.time is not None:
+                latest = min(latest, task.time*60)
+            latest_start[task] = latest
+
+        slack = {task: latest_start[task] - earliest_start[task]
+                 for task in self.tasks}
+
+        return earliest_start, latest_start, slack
+
     def format_time(self, time):
         """
         Formats given time (in minutes) to a string showing hours and minutes (time in the day)
@@ -112,7 +270,7 @@ class TaskScheduler:
         """
         return f"{int(time//60)}h{round(int(time%60), 2):02d}"
 
-    def greedy_run_task_scheduler(self, starting_time, will_print=True):
+    def greedy_run_task_scheduler(self, starting_time, will_print=True, fill_gaps=False, use_slack=False, improve=False, max_iterations=1000, time_budget=None, seed=0):
         """
         Runs the tasks in the task scheduler in order of priorities (for flexible-time tasks) and starting times (for fixed-time tasks)
         using the greedy approach
@@ -123,6 +281,21 @@ class TaskScheduler:
           time (in minutes) to start task scheduler
         will_print : bool
             whether to include print statements or not (included to avoid print statements in experimental time-complexity analysis)
+        fill_gaps : bool
+            whether to fill the time before a fixed-time task with the highest priority flexible task that fits
+            when the top flexible task does not (default False)
+        use_slack : bool
+            whether to use the slack of each task (see compute_slack) to skip flexible tasks whose dependencies cannot be
+            completed within the time period, and to start a flexible task ahead of the top one when waiting would make it
+            miss the fixed-time task it leads to (default False)
+        improve : bool
+            whether to run a local search over the greedy schedule afterwards (default False)
+        max_iterations : int
+            maximum number of local search moves to try if improve is True (default 1000)
+        time_budget : float
+            maximum number of seconds for the local search if improve is True, no limit if None (default None)
+        seed : int
+            seed for the local search's choice of moves if improve is True, so the same input gives the same schedule (default 0)
 
         Returns
         ----------
@@ -131,13 +304,76 @@ class TaskScheduler:
             and the total utility for our task scheduler if will_print is False
 
         """
-        # storing the order of execution of tasks
+        will_print and print("Running Somto's Greedy scheduler:\n")
+
+        # storing the order of execution of tasks and their slots
         tasks_order = []
-        tasks_complete = []
+        self.slots = []
+        stream = self.greedy_stream_task_scheduler(
+            starting_time, will_print, fill_gaps, use_slack)
+        while True:
+            try:
+                task, start_time, end_time, _ = next(stream)
+                tasks_order.append(task)
+                self.slots.append((task, start_time, end_time))
+            except StopIteration as stop:
+                current_time = stop.value
+                break
+
+        # total completion time
+        total_time = current_time - starting_time
+        will_print and print(
+            f"\n🏁 Completed all planned tasks in {self.format_time(total_time)}min!")
+        total_utility = sum([task.scaled_utility() for task in tasks_order]) / UTILITY_SCALE
+        will_print and print(f"Total utility: {round(total_utility, 2)}")
+
+        # try to improve the greedy choices with a local search
+        if improve:
+            tasks_order, total_utility = improve_schedule(
+                tasks_order, self.tasks, starting_time, self.time_period, max_iterations, time_budget, seed)
+            # flexible tasks run back to back, fixed-time tasks wait for their time
+            self.slots = []
+            current_time = starting_time
+            for task in tasks_order:
+                if task.time is not None:
+                    current_time = max(current_time, task.time*60)
+                self.slots.append((task, current_time, current_time + task.duration))
+                current_time += task.duration
+            will_print and print(
+                f"Total utility after local search: {round(total_utility, 2)}")
+
+        return (tasks_order, total_utility) if not will_print else None
 
+    def greedy_stream_task_scheduler(self, starting_time, will_print=False, fill_gaps=False, use_slack=False):
+        """
+        Runs the tasks in the task scheduler with the greedy approach as a generator, yielding each scheduled slot
+        as soon as the engine commits to it. The engine only moves on when the consumer asks for the next slot,
+        so a slow consumer (e.g. a calendar export) holds back the computation instead of slots piling up.
+
+        Parameters
+        ----------
+        starting_time : int/float
+          time (in minutes) to start task scheduler
+        will_print : bool
+            whether to include print statements or not (default False)
+        fill_gaps : bool
+            whether to fill the time before a fixed-time task with the highest priority flexible task that fits
+            when the top flexible task does not, among the tasks whose dependencies are completed (default False)
+        use_slack : bool
+            whether to use the slack of each task (see compute_slack) to skip flexible tasks whose dependencies cannot be
+            completed within the time period, and to start a flexible task ahead of the top one when waiting would make it
+            miss the fixed-time task it leads to (default False)
+
+        Returns
+        ----------
+        generator
+            yields (task, start time, end time, utility) for each scheduled task
+            and returns the time (in minutes) the scheduler stopped at
+
+        """
         def print_done_task_helper(task, start_time):
             """
-            Helper function that prints out a completed task and returns the time the task was completed
+            Helper generator that prints out a completed task, yields its slot and returns the time the task was completed
 
             Parameters
             ----------
@@ -148,24 +384,27 @@ class TaskScheduler:
 
             Returns
             ----------
-            int
-                end time (in minutes) of the task
+            generator
+                yields (task, start time, end time, utility) if the task is completed within the time period
+                and none of its dependencies was dropped, and returns the end time (in minutes) of the task
 
             """
             task.status = self.IN_PROGRESS
             end_time = start_time + task.duration
-            if end_time > starting_time + self.time_period:
+            # a fixed-time task cannot be moved before its time, so it is dropped if its time is past the time period
+            latest_end = end_time if task.time is None else max(end_time, task.time*60 + task.duration)
+            # a task is also dropped if one of its dependencies was dropped
+            if latest_end > starting_time + self.time_period or any(
+                    dependency.status == self.IN_PROGRESS for dependency in task.dependencies):
                 return start_time
             will_print and print(f"⌚️t={self.format_time(start_time)}")
             will_print and print(
                 f"\tstarted '{task.description}' for {task.duration} mins...")
-            # add task to tasks_order
-            tasks_order.append(task)
-            tasks_complete.append(task)
-            # end_time = start_time + task.duration
             will_print and print(
-                f"\t✅t={self.format_time(end_time)}, task completed with utility {round(1/task.unimportance(), 2)}!\n")
+                f"\t✅t={self.format_time(end_time)}, task completed with utility {round(task.utility(), 2)}!\n")
             task.status = self.COMPLETED
+            # hand the slot to the consumer as soon as it is committed
+            yield task, start_time, end_time, task.utility()
 
             return end_time
 
@@ -202,10 +441,44 @@ class TaskScheduler:
 
             return current_time
 
+        def is_ready_helper(task):
+            """
+            Helper function that checks if a task can be run now, i.e. all its dependencies are completed
+
+            Parameters
+            ----------
+            task : Task
+                a flexible-time task
+
+            Returns
+            ----------
+            bool
+                whether all the task's dependencies are completed
+
+            """
+            return all(dependency.status == self.COMPLETED for dependency in task.dependencies)
+
         current_time = starting_time
-        will_print and print("Running Somto's Greedy scheduler:\n")
         self.get_tasks_ready()
 
+        # index of the flexible tasks by duration to find the best task that fits before a fixed-time task
+        if fill_gaps:
+            duration_index = DurationIndex(self.flexible_time_priority_queue.heap)
+
+        # flexible tasks that cannot be completed within the time period once their dependencies are
+        infeasible_tasks = set()
+        if use_slack:
+            earliest_start, latest_start, _ = self.compute_slack(starting_time)
+            infeasible_tasks = {task for task in self.flexible_time_priority_queue.heap
+                                if earliest_start[task] + task.duration > starting_time + self.time_period}
+            # minimum heap of (latest start, position, task) for flexible tasks leading to a fixed-time task
+            urgent_queue = [(latest_start[task], position, task) for position, task in enumerate(self.flexible_time_priority_queue.heap)
+                            if latest_start[task] != float('inf') and task not in infeasible_tasks]
+            heapq.heapify(urgent_queue)
+            if fill_gaps:
+                for task in infeasible_tasks:
+                    duration_index.discard(task)
+
         # while there are tasks in the flexible and fixed time tasks priority queues
         while self.flexible_time_priority_queue and self.fixed_time_priority_queue:
 
@@ -213,42 +486,57 @@ class TaskScheduler:
             flexible_time_task = self.flexible_time_priority_queue.maxk()
             timed_task = self.fixed_time_priority_queue.maxk()
 
+            # skip flexible time tasks that were already completed while filling a gap or that cannot be completed
+            if flexible_time_task.status == self.COMPLETED or flexible_time_task in infeasible_tasks:
+                self.flexible_time_priority_queue.heappop()
+                continue
+
+            # an urgent task has to start now if it can still be completed before the timed task
+            if use_slack:
+                while urgent_queue and urgent_queue[0][2].status == self.COMPLETED:
+                    heapq.heappop(urgent_queue)
+                if urgent_queue and urgent_queue[0][0] < current_time+flexible_time_task.duration:
+                    next_task = heapq.heappop(urgent_queue)[2]
+                    if current_time+next_task.duration <= timed_task.time*60:
+                        fill_gaps and duration_index.discard(next_task)
+                        current_time = yield from print_done_task_helper(next_task, current_time)
+                    continue
+
             # if completing the flexible time task eats into the timed task start time
             if current_time+flexible_time_task.duration > timed_task.time*60:
-                # next task to be completed will be the fixed time task
-                next_task = self.fixed_time_priority_queue.heappop()
-                # check for free time and update current time
-                current_time = check_free_time_helper(current_time, next_task)
+                # the best flexible time task that still fits before the timed task, if any
+                next_task = fill_gaps and duration_index.pop_best_fit(
+                    timed_task.time*60 - current_time, is_ready_helper)
+                if not next_task:
+                    # next task to be completed will be the fixed time task
+                    next_task = self.fixed_time_priority_queue.heappop()
+                    # check for free time and update current time
+                    current_time = check_free_time_helper(current_time, next_task)
             # otherwise
             else:
                 # next task to be completed will be the flexible time task
                 next_task = self.flexible_time_priority_queue.heappop()
+                fill_gaps and duration_index.discard(next_task)
             # print completed task and update current time
-            current_time = print_done_task_helper(next_task, current_time)
+            current_time = yield from print_done_task_helper(next_task, current_time)
 
         # while there are still tasks in the fixed time priority queue
         while self.fixed_time_priority_queue:
             # complete the remaining fixed time tasks
             next_task = self.fixed_time_priority_queue.heappop()
             end_free_time = check_free_time_helper(current_time, next_task)
-            current_time = print_done_task_helper(next_task, end_free_time)
+            current_time = yield from print_done_task_helper(next_task, end_free_time)
 
         # while there are still tasks in the flexible time priority queue
         while self.flexible_time_priority_queue:
-            # complete the remaining flexible time tasks
+            # complete the remaining flexible time tasks, skipping those already completed or that cannot be completed
             next_task = self.flexible_time_priority_queue.heappop()
-            current_time = print_done_task_helper(next_task, current_time)
+            if next_task.status != self.COMPLETED and next_task not in infeasible_tasks:
+                current_time = yield from print_done_task_helper(next_task, current_time)
 
-        # total completion time
-        total_time = current_time - starting_time
-        will_print and print(
-            f"\n🏁 Completed all planned tasks in {self.format_time(total_time)}min!")
-        total_utility = sum([1/task.unimportance() for task in tasks_order])
-        will_print and print(f"Total utility: {round(total_utility, 2)}")
+        return current_time
 
-        return (tasks_order, total_utility) if not will_print else None
-
-    def dp_run_task_scheduler(self, starting_time, will_print=True):
+    def dp_run_task_scheduler(self, starting_time, will_print=True, solver="dense", use_slack=False, group_duplicates=False):
         """
         Runs the tasks in the task scheduler in order of priorities (for flexible-time tasks) and starting times (for fixed-time tasks)
         using the dynamic programming approach
@@ -259,6 +547,16 @@ class TaskScheduler:
           time (in minutes) to start task scheduler
         will_print : bool
             whether to include print statements or not (included to avoid print statements in experimental time-complexity analysis)
+        solver : str
+            "dense" fills the full (tasks x capacity) dynamic programming matrix over 30-minute slots, each task taking
+            its duration rounded up to whole slots, "pareto" only keeps the non-dominated (time used, utility) states for each task (default "dense")
+        use_slack : bool
+            whether to leave out flexible tasks whose dependencies cannot be completed in time for them
+            to be completed within the time period (see compute_slack) (default False)
+        group_duplicates : bool
+            whether to group identical tasks (same duration, utility and dependencies) into counted items,
+            split into rows of 1, 2, 4, ... copies, so the dynamic programming has O(log count) rows per group
+            instead of one per task (default False)
 
         Returns
         ----------
@@ -274,7 +572,63 @@ class TaskScheduler:
             "Running Somto's Dynamic Programming scheduler:\n")
         self.get_tasks_ready()
 
-        def get_optimal_tasks_helper(capacity):
+        def get_dp_rows_helper():
+            """
+            Helper function that turns the remaining flexible tasks into dynamic programming rows,
+            grouping identical tasks and splitting each group into rows of 1, 2, 4, ... copies if group_duplicates is True
+
+            Parameters
+            ----------
+            None
+
+            Returns
+            ----------
+            list[tuple]
+                (duration, scaled utility, tasks) for each row
+
+            """
+            if not group_duplicates:
+                return [(task.duration, task.scaled_utility(), [task]) for task in tasks]
+
+            # identical tasks, in the order their first copy appears
+            groups = {}
+            for task in tasks:
+                key = (task.duration, task.scaled_utility(),
+                       frozenset(dependency.id for dependency in task.dependencies))
+                groups.setdefault(key, []).append(task)
+
+            # binary splitting: any number of copies up to the group size is a sum of these rows
+            rows = []
+            for (duration, utility, _), copies in groups.items():
+                start, size = 0, 1
+                while start < len(copies):
+                    size = min(size, len(copies) - start)
+                    rows.append((duration*size, utility*size,
+                                copies[start:start + size]))
+                    start += size
+                    size *= 2
+
+            return rows
+
+        def get_row_slots_helper(rows):
+            """
+            Helper function that returns the number of 30-minute slots each row takes in the dynamic programming matrix:
+            every task takes its duration rounded up to whole slots, so the chosen tasks always fit in the time constraint
+
+            Parameters
+            ----------
+            rows : list[tuple]
+                (duration, scaled utility, tasks) for each row
+
+            Returns
+            ----------
+            list[int]
+                number of slots for each row
+
+            """
+            return [sum(-(-task.duration // 30) for task in row_tasks) for _, _, row_tasks in rows]
+
+        def get_optimal_tasks_helper(capacity, rows, slots):
             """
             Helper function that generates the dynamic programming matrix given a time constraint
 
@@ -282,6 +636,10 @@ class TaskScheduler:
             ----------
             capacity : int/float
                 time constraint for the tasks
+            rows : list[tuple]
+                (duration, scaled utility, tasks) for each row
+            slots : list[int]
+                number of 30-minute slots for each row (see get_row_slots_helper)
 
             Returns
             ----------
@@ -289,6 +647,7 @@ class TaskScheduler:
                 dynamic programming matrix that gives maximum utility
 
             """
+            n = len(rows)
             # nothing can be done
             if capacity <= 0 or n == 0:
                 return 0
@@ -302,17 +661,17 @@ class TaskScheduler:
 
             # if we have only one time slot, we will take a task if its duration is within the time slot and store utility = 1/unimportance level
             for c in range(0, capacity+1):
-                if tasks[0].duration <= c*30:
-                    dp_matrix[0][c] = round(1/tasks[0].unimportance(), 2)
+                if slots[0] <= c:
+                    dp_matrix[0][c] = rows[0][1]
 
             # process all sub-arrays for all the time slots
             for row in range(1, n):
+                row_slots, utility = slots[row], rows[row][1]
                 for c in range(1, capacity+1):
                     util1, util2 = 0, 0
                     # include the item, if it fits within the time slot
-                    if tasks[row].duration <= c*30 and int(c - tasks[row].duration/30) >= 0:
-                        util1 = round(round(
-                            1/tasks[row].unimportance(), 2) + dp_matrix[row - 1][c - tasks[row].duration//30], 2)
+                    if row_slots <= c:
+                        util1 = utility + dp_matrix[row - 1][c - row_slots]
                     # exclude the item
                     util2 = dp_matrix[row - 1][c]
                     # take maximum
@@ -322,7 +681,7 @@ class TaskScheduler:
             res = dp_matrix[n - 1][capacity]
             return dp_matrix
 
-        def read_dp_table_helper(table, capacity):
+        def read_dp_table_helper(table, capacity, rows, slots):
             """
             Helper function that generates the optimal tasks given a dynamic programming matrix
 
@@ -332,6 +691,10 @@ class TaskScheduler:
                 time constraint for the tasks
             capacity : int/float
                 time constraint for the tasks
+            rows : list[tuple]
+                (duration, scaled utility, tasks) for each row of the matrix
+            slots : list[int]
+                number of 30-minute slots for each row (see get_row_slots_helper)
 
             Returns
             ----------
@@ -342,36 +705,97 @@ class TaskScheduler:
             # store optimal tasks
             optimal_tasks = []
             # reading baclwards from bottom right
-            for row in range(n-1, -1, -1):
+            for row in range(len(rows)-1, -1, -1):
                 # if current cell is same as above
                 if table[row][capacity] == table[row-1][capacity] and row != 0:
                     # and current cell is at row 1
                     if row == 1:
-                        # row 0 is the optimal task
-                        optimal_tasks.append(tasks[0])
+                        # row 0 is the optimal task, if it fits in the remaining capacity
+                        if table[0][capacity] > 0:
+                            optimal_tasks.extend(rows[0][2])
                         break
                     # otherwise, move on to next row
                     else:
                         continue
+                # row 0 is only an optimal task if it fits in the remaining capacity
+                elif row == 0 and table[0][capacity] == 0:
+                    break
                 # if current cell not same as above
                 else:
                     # the current row represents an optimal task
-                    optimal_tasks.append(tasks[row])
-                    # reduce capacity by the optimal task's duration
-                    capacity -= tasks[row].duration // 30
+                    optimal_tasks.extend(rows[row][2])
+                    # reduce capacity by the optimal task's slots
+                    capacity -= slots[row]
 
             return optimal_tasks
 
-        def print_optimal_tasks_helper(capacity, utility, current_time):
+        def get_pareto_optimal_tasks_helper(max_minutes, rows):
+            """
+            Helper function that finds the optimal tasks given a time constraint by only keeping
+            the non-dominated (time used, utility) states after each task is considered
+
+            Parameters
+            ----------
+            max_minutes : int/float
+                time constraint (in minutes) for the tasks
+            rows : list[tuple]
+                (duration, scaled utility, tasks) for each row
+
+            Returns
+            ----------
+            list
+                the optimal tasks for the time constraint
+
+            """
+            # nothing can be done
+            if max_minutes <= 0 or not rows:
+                return []
+
+            # the frontier is sorted by time used with strictly increasing utility;
+            # each state is (time used, utility, chosen tasks as a linked list of (row, previous link))
+            frontier = [(0, 0, None)]
+
+            for row, (duration, task_utility, _) in enumerate(rows):
+                # states that include the current task, if it fits within the time constraint
+                included = [(time + duration, utility + task_utility, (row, chosen))
+                            for time, utility, chosen in frontier
+                            if time + duration <= max_minutes]
+
+                # merge both sorted lists, dropping every state that uses more time for no more utility
+                merged = []
+                i, j = 0, 0
+                while i < len(frontier) or j < len(included):
+                    if j == len(included) or (i < len(frontier) and frontier[i][:2] <= included[j][:2]):
+                        state = frontier[i]
+                        i += 1
+                    else:
+                        state = included[j]
+                        j += 1
+                    if not merged or state[1] > merged[-1][1]:
+                        if merged and merged[-1][0] == state[0]:
+                            merged.pop()
+                        merged.append(state)
+                frontier = merged
+
+            # maximum utility is the last state on the frontier
+            optimal_tasks = []
+            chosen = frontier[-1][2]
+            while chosen:
+                row, chosen = chosen
+                optimal_tasks.extend(rows[row][2])
+
+            return optimal_tasks
+
+        def print_optimal_tasks_helper(max_minutes, utility, current_time):
             """
             Helper function that prints the optimal tasks and returns the time after completion as well as the utility
 
             Parameters
             ----------
-            capacity : int/float
-                time constraint for the tasks
-            utility : int/float
-                total task scheduler utility so far
+            max_minutes : int/float
+                time constraint (in minutes) for the tasks, rounded down to whole 30-minute slots by the dense solver
+            utility : int
+                total task scheduler utility so far, scaled by UTILITY_SCALE
             current_time : int/float
                 current scheduler time
 
@@ -382,11 +806,17 @@ class TaskScheduler:
 
             """
             # get the optimal tasks
-            table = get_optimal_tasks_helper(capacity)
-            if table == 0:
-                optimal_tasks = []
+            rows = get_dp_rows_helper()
+            if solver == "pareto":
+                optimal_tasks = get_pareto_optimal_tasks_helper(max_minutes, rows)
             else:
-                optimal_tasks = read_dp_table_helper(table, capacity)
+                capacity = int(max_minutes // 30)
+                slots = get_row_slots_helper(rows)
+                table = get_optimal_tasks_helper(capacity, rows, slots)
+                if table == 0:
+                    optimal_tasks = []
+                else:
+                    optimal_tasks = read_dp_table_helper(table, capacity, rows, slots)
 
             # heap to organize our tasks by priority
             optimal_heap = MaxHeapq()
@@ -399,7 +829,7 @@ class TaskScheduler:
                 # remove task from tasks list after completion
                 tasks.remove(task)
                 # increase task scheduler utility by the task's util
-                utility += 1/task.unimportance()
+                utility += task.scaled_utility()
 
                 task.status = self.IN_PROGRESS
                 will_print and print(f"⌚️t={self.format_time(current_time)}")
@@ -407,9 +837,10 @@ class TaskScheduler:
                     f"\tstarted '{task.description}' for {task.duration} mins...")
                 # add task to tasks_order
                 tasks_order.append(task)
+                self.slots.append((task, current_time, current_time + task.duration))
                 current_time += task.duration
                 will_print and print(
-                    f"\t✅t={self.format_time(current_time)}, task completed with utility {round(1/task.unimportance(), 2)}!\n")
+                    f"\t✅t={self.format_time(current_time)}, task completed with utility {round(task.utility(), 2)}!\n")
                 task.status = self.COMPLETED
 
             return utility, current_time
@@ -421,17 +852,22 @@ class TaskScheduler:
         if len(self.fixed_time_priority_queue)+len(self.flexible_time_priority_queue) < len(self.tasks):
             self.get_tasks_ready()
 
-        # we use only flexible time tasks for the dp tables
-        tasks = self.flexible_time_priority_queue.heap[:]
-
         current_time = starting_time
         max_time = starting_time + self.time_period
+        self.slots = []
 
+        # we use only flexible time tasks for the dp tables
+        tasks = self.flexible_time_priority_queue.heap[:]
+        if use_slack:
+            earliest_start, _, _ = self.compute_slack(starting_time)
+            tasks = [task for task in tasks
+                     if earliest_start[task] + task.duration <= max_time]
+
+        has_fixed_time_tasks = bool(self.fixed_time_priority_queue)
         # if there are no fixed time tasks
-        if not self.fixed_time_priority_queue:
-            n = len(tasks)
+        if not has_fixed_time_tasks:
             # capacity is our task scheduler's total capacity
-            capacity = int((max_time - current_time) // 30)
+            capacity = max_time - current_time
             # show tasks and update current time and utility
             util, current_time = print_optimal_tasks_helper(
                 capacity, total_utility, current_time)
@@ -439,7 +875,6 @@ class TaskScheduler:
 
         # if there are fixed time tasks
         while self.fixed_time_priority_queue and current_time < max_time:
-            n = len(tasks)
             tasks = sorted(tasks, key=lambda x: x.duration)
 
             # get the time for the next task
@@ -449,11 +884,11 @@ class TaskScheduler:
             # if the time is within our constraint
             if next_time < max_time:
                 # the capacity is the time chunk between current time and next fixed time
-                capacity = int((next_time - current_time) // 30)
+                capacity = next_time - current_time
             # otherwise
             else:
                 # the capacity is the remaining time left within our constraint
-                capacity = int((max_time - current_time) // 30)
+                capacity = max_time - current_time
             # show tasks and update current time and utility
             util, current_time = print_optimal_tasks_helper(
                 capacity, total_utility, current_time)
@@ -462,21 +897,771 @@ class TaskScheduler:
             # show fixed time task if it can be completed within our constraint
             if next_time < max_time:
                 next_timed_task.status = self.IN_PROGRESS
-                total_utility += 1/next_timed_task.unimportance()
+                total_utility += next_timed_task.scaled_utility()
 
+                # wait for the fixed time if the optimal tasks left free time before it
+                current_time = max(current_time, next_time)
                 will_print and print(f"⌚️t={self.format_time(current_time)}")
                 will_print and print(
                     f"\tstarted '{next_timed_task.description}' for {next_timed_task.duration} mins...")
 
+                self.slots.append((next_timed_task, current_time, current_time + next_timed_task.duration))
                 current_time += next_timed_task.duration
                 will_print and print(
-                    f"\t✅t={self.format_time(current_time)}, task completed with utility {round(1/task.unimportance(), 2)}!\n")
+                    f"\t✅t={self.format_time(current_time)}, task completed with utility {round(task.utility(), 2)}!\n")
                 next_timed_task.status = self.COMPLETED
 
+        # fill the time left after the last fixed time task
+        if has_fixed_time_tasks and current_time < max_time:
+            capacity = max_time - current_time
+            util, current_time = print_optimal_tasks_helper(
+                capacity, total_utility, current_time)
+            total_utility = util
+
         # show the total time for completion as well as utility
         total_time = current_time - starting_time
+        total_utility /= UTILITY_SCALE
         will_print and print(
             f"\n🏁 Completed all planned tasks in {self.format_time(total_time)}min!")
         will_print and print(f"Total utility: {round(total_utility,2)}")
 
         return (tasks_order, total_utility) if not will_print else None
+
+    def beam_run_task_scheduler(self, starting_time, will_print=True, beam_width=8, depth=None):
+        """
+        Runs the tasks in the task scheduler with a beam search over partial schedules. The time period is split into gaps
+        before each fixed-time task, and a partial schedule is the flexible tasks put in each gap so far. It grows one
+        step at a time: either put one of the beam_width highest-utility flexible tasks that fits in the current gap and
+        whose flexible dependencies are already scheduled, or close the gap and move past its fixed-time task. Partial
+        schedules with the same gap, time used and tasks are merged, and only the beam_width partial schedules with the
+        best utility plus an estimate of the utility they can still get (the fractional knapsack of the remaining time)
+        are kept at each step. With a depth, the search only looks depth steps ahead, commits the first step of the best
+        partial schedule found and starts again from there.
+        Each step costs O(beam_width^2) expansions, each bounded in O(n).
+
+        Parameters
+        ----------
+        starting_time : int/float
+          time (in minutes) to start task scheduler
+        will_print : bool
+            whether to include print statements or not (included to avoid print statements in experimental time-complexity analysis)
+        beam_width : int
+            number of partial schedules kept, and of tasks tried from each of them, at every step (default 8)
+        depth : int
+            number of steps to look ahead before committing to one, None to search until the end of the time period (default None)
+
+        Returns
+        ----------
+        lst, int
+            a lists of the order the tasks should be executed
+            and the total utility for our task scheduler if will_print is False
+
+        """
+        will_print and print("Running Somto's Beam search scheduler:\n")
+        for task in self.tasks:
+            task.status = self.NOT_STARTED
+        self.get_tasks_ready()
+        max_time = starting_time + self.time_period
+
+        # flexible tasks from the highest to the lowest utility, and their cached utilities
+        flexible_tasks = sorted(self.flexible_time_priority_queue.heap, key=lambda task: -task.scaled_utility())
+        utilities = [task.scaled_utility() for task in flexible_tasks]
+        position = {task: i for i, task in enumerate(flexible_tasks)}
+        # bit mask of the flexible dependencies of each task, which have to be scheduled before it
+        dependency_masks = [sum(1 << position[dependency] for dependency in set(task.dependencies) if dependency in position)
+                            for task in flexible_tasks]
+        # flexible tasks from the highest to the lowest utility per minute, for the estimates
+        density_order = sorted(range(len(flexible_tasks)),
+                               key=lambda i: -utilities[i] / max(flexible_tasks[i].duration, 1))
+
+        # the gaps: capacity (in minutes) before each fixed-time task that starts within the time period, then the rest
+        fixed_tasks = []
+        capacities = []
+        current_time = starting_time
+        while self.fixed_time_priority_queue:
+            fixed_task = self.fixed_time_priority_queue.heappop()
+            if fixed_task.time*60 >= max_time:
+                break
+            capacities.append(max(0, fixed_task.time*60 - current_time))
+            fixed_tasks.append(fixed_task)
+            current_time = max(current_time, fixed_task.time*60) + fixed_task.duration
+        capacities.append(max(0, max_time - current_time))
+        # capacity of the gaps after each gap, and utility of the fixed-time tasks from each gap on
+        later_capacities = [0]*len(capacities)
+        fixed_utilities = [0]*(len(capacities) + 1)
+        for g in range(len(capacities) - 1, -1, -1):
+            if g < len(capacities) - 1:
+                later_capacities[g] = later_capacities[g + 1] + capacities[g + 1]
+            fixed_utilities[g] = fixed_utilities[g + 1] + (fixed_tasks[g].scaled_utility() if g < len(fixed_tasks) else 0)
+
+        def bound_helper(gap, used, mask):
+            """
+            Helper function that estimates the utility a partial schedule can still get: the fixed-time tasks left, the time
+            left in the current gap filled with the unscheduled tasks that fit in it, then the later gaps filled with the rest,
+            both taking the tasks with the highest utility per minute first and the last one in part
+
+            Parameters
+            ----------
+            gap : int
+                index of the current gap
+            used : int/float
+                time (in minutes) used in the current gap
+            mask : int
+                bit mask of the scheduled flexible tasks
+
+            Returns
+            ----------
+            float
+                estimated scaled utility of the rest of the schedule
+
+            """
+            if gap == len(capacities):
+                return 0
+            bound = fixed_utilities[gap]
+            # time left in the current gap can only hold the tasks that fit in it
+            for remaining, fits_in_gap in ((capacities[gap] - used, True), (later_capacities[gap], False)):
+                for i in density_order:
+                    if remaining <= 0:
+                        break
+                    duration = flexible_tasks[i].duration
+                    if mask >> i & 1 or (fits_in_gap and duration > capacities[gap] - used):
+                        continue
+                    mask |= 1 << i
+                    if duration <= remaining:
+                        bound += utilities[i]
+                        remaining -= duration
+                    else:
+                        bound += utilities[i] * remaining / duration
+                        remaining = 0
+            return bound
+
+        def expand_helper(state):
+            """
+            Helper function that returns the partial schedules one step after a partial schedule
+
+            Parameters
+            ----------
+            state : tuple
+                (score, utility, gap, used, mask, path) of the partial schedule, path being a linked list of
+                (step, previous path) with the index of the task put in the gap or None for closing the gap as steps
+
+            Returns
+            ----------
+            list[tuple]
+                the partial schedules after each possible step
+
+            """
+            _, utility, gap, used, mask, path = state
+            children = []
+            # put one of the highest-utility tasks that fit and are ready
+            for i, task in enumerate(flexible_tasks):
+                if len(children) == beam_width:
+                    break
+                if not mask >> i & 1 and used + task.duration <= capacities[gap] \
+                        and dependency_masks[i] & mask == dependency_masks[i]:
+                    child_mask = mask | 1 << i
+                    child_utility = utility + utilities[i]
+                    children.append((child_utility + bound_helper(gap, used + task.duration, child_mask), child_utility,
+                                     gap, used + task.duration, child_mask, (i, path)))
+            # close the gap and run its fixed-time task
+            child_utility = utility + (fixed_tasks[gap].scaled_utility() if gap < len(fixed_tasks) else 0)
+            children.append((child_utility + bound_helper(gap + 1, 0, mask), child_utility, gap + 1, 0, mask, (None, path)))
+
+            return children
+
+        def search_helper(root):
+            """
+            Helper function that runs the beam search from a partial schedule for depth steps (or until every
+            partial schedule is complete) and returns the best partial or complete schedule found
+
+            Parameters
+            ----------
+            root : tuple
+                the partial schedule to start from
+
+            Returns
+            ----------
+            tuple
+                the partial schedule with the best score
+
+            """
+            beam = [root]
+            # complete schedules leave the beam, so optimistic partial schedules cannot push them out
+            complete = []
+            steps = 0
+            while beam and (depth is None or steps < depth):
+                # merge partial schedules with the same gap, time used and tasks, keeping the best utility
+                best = {}
+                for state in beam:
+                    for child in expand_helper(state):
+                        key = child[2:5]
+                        if key not in best or child[1] > best[key][1]:
+                            best[key] = child
+                complete.extend(state for state in best.values() if state[2] == len(capacities))
+                beam = heapq.nlargest(beam_width, [state for state in best.values() if state[2] < len(capacities)],
+                                      key=lambda state: state[:2])
+                steps += 1
+            return max(beam + complete, key=lambda state: state[:2])
+
+        state = (bound_helper(0, 0, 0), 0, 0, 0, 0, None)
+        while state[2] < len(capacities):
+            best = search_helper(state)
+            if depth is None:
+                state = best
+                break
+            # commit the first step of the best partial schedule
+            path = best[5]
+            while path[1] is not state[5]:
+                path = path[1]
+            state = next(child for child in expand_helper(state) if child[5][0] == path[0])
+
+        # steps in order, split into gaps
+        steps = []
+        path = state[5]
+        while path is not None:
+            steps.append(path[0])
+            path = path[1]
+        gaps = [[]]
+        for step in reversed(steps):
+            if step is None:
+                gaps.append([])
+            else:
+                gaps[-1].append(flexible_tasks[step])
+
+        tasks_order = []
+        self.slots = []
+        total_utility = 0
+        current_time = starting_time
+        for g, gap in enumerate(gaps):
+            next_tasks = gap + ([fixed_tasks[g]] if g < len(fixed_tasks) else [])
+            for task in next_tasks:
+                if task.time is not None:
+                    current_time = max(current_time, task.time*60)
+                task.status = self.IN_PROGRESS
+                will_print and print(f"⌚️t={self.format_time(current_time)}")
+                will_print and print(
+                    f"\tstarted '{task.description}' for {task.duration} mins...")
+                tasks_order.append(task)
+                self.slots.append((task, current_time, current_time + task.duration))
+                total_utility += task.scaled_utility()
+                current_time += task.duration
+                will_print and print(
+                    f"\t✅t={self.format_time(current_time)}, task completed with utility {round(task.utility(), 2)}!\n")
+                task.status = self.COMPLETED
+
+        total_utility /= UTILITY_SCALE
+        will_print and print(
+            f"\n🏁 Completed all planned tasks in {self.format_time(current_time - starting_time)}min!")
+        will_print and print(f"Total utility: {round(total_utility, 2)}")
+
+        return (tasks_order, total_utility) if not will_print else None
+
+    def multi_lane_run_task_scheduler(self, starting_time, workers, blocked_times=None, will_print=True):
+        """
+        Assigns the tasks in the task scheduler to several parallel workers using list scheduling:
+        whenever a worker becomes free, the highest priority flexible task whose dependencies have all been assigned is
+        started on the worker where it can start earliest, no earlier than when those dependencies finish and outside
+        that worker's blocked times. Fixed-time tasks are given a worker up front, in time order, whose
+        time is free at their fixed time, and that time is then blocked for flexible tasks like the worker's own blocked times.
+        A fixed-time task is rejected if no worker is free at its time or its dependencies finish after it, and so are the
+        tasks depending on a rejected task.
+        Runs in O((V+E) log V + (V+F) k B) for V tasks, E dependencies, k workers, F fixed-time tasks and B blocked times.
+
+        Parameters
+        ----------
+        starting_time : int/float
+            time (in minutes) all workers become available
+        workers : int
+            number of parallel workers (lanes)
+        blocked_times : dict
+            list of (start, end) times (in minutes) each worker index is unavailable for, e.g. its own meetings (default None)
+        will_print : bool
+            whether to include print statements or not (included to avoid print statements in experimental time-complexity analysis)
+
+        Returns
+        ----------
+        lst, int, lst
+            a list of (task, worker, start time, end time) in the order the tasks were assigned,
+            the makespan (in minutes) of the schedule, None if any task was rejected,
+            and the rejected tasks if will_print is False
+
+        """
+        will_print and print(
+            f"Running Somto's multi-lane scheduler with {workers} workers:\n")
+        self.apply_priority_model()
+
+        # blocked times of each worker
+        blocked_times = blocked_times or {}
+        blocks = [list(blocked_times.get(worker, []))
+                  for worker in range(workers)]
+
+        # reserve a worker for each fixed-time task at its fixed time
+        reservations = {}
+        for task in sorted((task for task in self.tasks if task.time is not None), key=lambda task: task.time):
+            start_time = task.time*60
+            if start_time < starting_time:
+                continue
+            for worker in range(workers):
+                if all(block_end <= start_time or block_start >= start_time + task.duration
+                       for block_start, block_end in blocks[worker]):
+                    reservations[task] = worker
+                    blocks[worker].append((start_time, start_time + task.duration))
+                    break
+
+        # blocked times of each worker sorted by start time, and how many of them each worker is already past
+        for worker_blocks in blocks:
+            worker_blocks.sort()
+        next_block = [0]*workers
+
+        # number of unassigned dependencies of each task, the tasks depending on each task,
+        # and the earliest time each task can start given its assigned dependencies
+        dependencies, dependents, _ = self.dependency_graph()
+        remaining = {task: len(dependencies[task]) for task in self.tasks}
+        release_times = {task: starting_time for task in self.tasks}
+
+        assignments = []
+        makespan_end = starting_time
+
+        def assign_helper(task, worker, start_time):
+            """
+            Helper function that assigns a task to a worker and releases the tasks depending on it
+
+            Parameters
+            ----------
+            task : Task
+                the task
+            worker : int
+                index of the worker
+            start_time : int/float
+                time (in minutes) the task starts
+
+            Returns
+            ----------
+            int/float
+                time (in minutes) the task ends
+
+            """
+            nonlocal makespan_end
+            end_time = start_time + task.duration
+            task.status = self.COMPLETED
+            assignments.append((task, worker, start_time, end_time))
+            makespan_end = max(makespan_end, end_time)
+            will_print and print(
+                f"⌚️t={self.format_time(start_time)}, worker {worker + 1} started '{task.description}' for {task.duration} mins...")
+
+            # the tasks depending on this one cannot start before it finishes
+            for dependent in dependents[task]:
+                release_times[dependent] = max(
+                    release_times[dependent], end_time)
+                remaining[dependent] -= 1
+                if not remaining[dependent]:
+                    release_helper(dependent)
+            return end_time
+
+        def release_helper(task):
+            """
+            Helper function that releases a task whose dependencies have all been assigned: a flexible task goes into the
+            release queue, a fixed-time task runs on its reserved worker if its dependencies finish in time
+
+            Parameters
+            ----------
+            task : Task
+                the task
+
+            Returns
+            ----------
+            None
+
+            """
+            if task.time is None:
+                heapq.heappush(release_queue, (release_times[task], positions[task], task))
+            elif task in reservations and release_times[task] <= task.time*60:
+                assign_helper(task, reservations[task], task.time*60)
+
+        # minimum heap of (release time, position, task) for tasks whose dependencies have all been assigned,
+        # and a maximum heap of the released ones organized by priority
+        release_queue = []
+        ready_queue = MaxHeapq()
+        positions = {task: position for position, task in enumerate(self.tasks)}
+        for task in self.tasks:
+            task.status = self.NOT_STARTED
+        for task in self.tasks:
+            if not remaining[task]:
+                release_helper(task)
+
+        def feasible_start_helper(task, worker, start_time):
+            """
+            Helper function that returns the earliest time a task can start on a worker, after any of the worker's
+            blocked times it would overlap
+
+            Parameters
+            ----------
+            task : Task
+                the task
+            worker : int
+                index of the worker
+            start_time : int/float
+                earliest time (in minutes) the task and the worker are both ready
+
+            Returns
+            ----------
+            int/float
+                time (in minutes) the task can start on the worker
+
+            """
+            worker_blocks = blocks[worker]
+            block = next_block[worker]
+            while block < len(worker_blocks):
+                block_start, block_end = worker_blocks[block]
+                if block_start < start_time + task.duration and block_end > start_time:
+                    start_time = block_end
+                elif block_start >= start_time + task.duration:
+                    break
+                block += 1
+            return start_time
+
+        # time each worker is available
+        available_times = [starting_time]*workers
+
+        while release_queue or ready_queue:
+            available_time = min(available_times)
+
+            # if nothing is released by the time a worker is available, the workers wait for the next release
+            if not ready_queue and release_queue[0][0] > available_time:
+                available_time = release_queue[0][0]
+            # release every task that can start by then
+            while release_queue and release_queue[0][0] <= available_time:
+                task = heapq.heappop(release_queue)[2]
+                ready_queue.heappush(task)
+                task.status = self.IN_PRIOIRITY_QUEUE
+            task = ready_queue.heappop()
+
+            # the worker where the task can start earliest, once both are ready and outside the worker's blocked times
+            start_time, worker = min((feasible_start_helper(task, worker, max(available_times[worker], release_times[task])), worker)
+                                     for worker in range(workers))
+
+            available_times[worker] = assign_helper(task, worker, start_time)
+            # the worker's blocked times before its new available time are never looked at again
+            while next_block[worker] < len(blocks[worker]) and blocks[worker][next_block[worker]][1] <= available_times[worker]:
+                next_block[worker] += 1
+
+        # tasks never assigned: fixed-time tasks that missed their time and everything depending on a rejected task
+        rejected = [task for task in self.tasks if task.status != self.COMPLETED]
+        for task in rejected:
+            will_print and print(
+                f"❌ '{task.description}' cannot start at its fixed time or depends on a rejected task")
+
+        makespan = None if rejected else makespan_end - starting_time
+        if makespan is not None:
+            will_print and print(
+                f"\n🏁 Completed all tasks with {workers} workers in {self.format_time(makespan)}min!")
+
+        return (assignments, makespan, rejected) if not will_print else None
+
+    def estimate_engine_costs(self, beam_width=8):
+        """
+        Estimates the running time (in seconds) of each engine on the tasks in the task scheduler from the number of
+        tasks n, the number of dependencies E, the number of gaps between fixed-time tasks g and the capacity in 30-minute slots C.
+        Every engine computes the priorities (V+E), the greedy engines then use heaps (n log n),
+        the dense dynamic programming fills about n*(C+g) cells and the Pareto one keeps at most one state per
+        reachable duration, about n*(C*30/d + g) for d the greatest common divisor of the durations.
+        The beam search takes at most one step per slot or gap, each expanding about w*(w+1) partial schedules
+        for a beam width w.
+
+        Parameters
+        ----------
+        beam_width : int
+            beam width of the beam search engine (default 8)
+
+        Returns
+        ----------
+        dict
+            estimated running time (in seconds) of each engine
+
+        """
+        n = len([task for task in self.tasks if task.time is None])
+        gaps = len(self.tasks) - n + 1
+        edges = sum(len(task.dependencies) for task in self.tasks)
+        slots = int(self.time_period // 30)
+        divisor = reduce(math.gcd, [int(task.duration) for task in self.tasks if task.time is None], 0) or 30
+
+        priorities = self.PRIORITY_COST * (len(self.tasks) + edges)
+        heaps = self.HEAP_COST * n * max(1, math.log2(n + 1))
+        pareto_states = min(slots*30 // divisor + 1, 2**min(n, 60))
+
+        return {
+            "pareto": priorities + self.PARETO_STATE_COST * n * (pareto_states + gaps),
+            "dp": priorities + self.DP_CELL_COST * n * (slots + gaps),
+            "beam": priorities + heaps + self.BEAM_STATE_COST * (slots + gaps) * beam_width*(beam_width + 1),
+            "greedy_improve": priorities + 2*heaps + self.LOCAL_SEARCH_MOVE_COST * 1000,
+            "greedy_fill": priorities + 2*heaps,
+            "greedy": priorities + heaps,
+            "deadline": priorities + 3*heaps,
+        }
+
+    def choose_engine(self, latency_budget=1.0):
+        """
+        Picks the best-quality engine whose estimated running time fits within the latency budget,
+        preferring the cheaper of the two dynamic programming engines when they reach the same utility, i.e. when every
+        flexible duration is a whole number of 30-minute slots (otherwise the dense one rounds durations up and ranks
+        below the Pareto one), and falls back to the greedy engine if nothing fits. Tasks with release times or deadlines always use
+        the deadline engine, since it is the only one that respects them. The choice is recorded in engine_choice.
+
+        Parameters
+        ----------
+        latency_budget : float
+            maximum running time (in seconds) allowed (default 1.0)
+
+        Returns
+        ----------
+        str
+            name of the chosen engine
+
+        """
+        estimates = self.estimate_engine_costs()
+        fitting = [engine for engine in self.ENGINES
+                   if engine != "deadline" and estimates[engine] <= latency_budget]
+        # the dense dynamic programming is only optimal if rounding durations up to 30-minute slots changes nothing
+        optimal_engines = ("pareto", "dp") if all(
+            task.duration % 30 == 0 for task in self.tasks if task.time is None) else ("pareto",)
+        dp_engines = [engine for engine in optimal_engines if engine in fitting]
+
+        if any(task.release is not None or task.deadline is not None for task in self.tasks):
+            engine = "deadline"
+            reason = f"tasks have time windows, only the deadline engine respects them (estimated at {estimates[engine]:.4f}s)"
+        elif dp_engines:
+            engine = min(dp_engines, key=lambda engine: estimates[engine])
+            reason = f"optimal engine '{engine}' estimated at {estimates[engine]:.4f}s fits the {latency_budget}s budget"
+        elif fitting:
+            engine = fitting[0]
+            reason = (f"optimal dynamic programming estimated at {min(estimates[engine] for engine in optimal_engines):.4f}s exceeds the {latency_budget}s budget, "
+                      f"'{engine}' estimated at {estimates[engine]:.4f}s is the best engine that fits")
+        else:
+            engine = "greedy"
+            reason = f"no engine fits the {latency_budget}s budget, using the cheapest one estimated at {estimates[engine]:.4f}s"
+
+        self.engine_choice = {"engine": engine,
+                              "estimates": estimates, "reason": reason}
+        return engine
+
+    def run_task_scheduler(self, starting_time, engine="auto", will_print=True, latency_budget=1.0, **options):
+        """
+        Runs the tasks in the task scheduler with the given engine, or with the engine picked by choose_engine if engine is "auto"
+
+        Parameters
+        ----------
+        starting_time : int/float
+          time (in minutes) to start task scheduler
+        engine : str
+            a name from ENGINES or "auto" (default "auto")
+        will_print : bool
+            whether to include print statements or not (included to avoid print statements in experimental time-complexity analysis)
+        latency_budget : float
+            maximum running time (in seconds) allowed when engine is "auto" (default 1.0)
+        options : dict
+            further keyword arguments passed on to the engine
+
+        Returns
+        ----------
+        lst, int
+            a lists of the order the tasks should be executed
+            and the total utility for our task scheduler if will_print is False
+
+        """
+        if engine == "auto":
+            engine = self.choose_engine(latency_budget)
+            will_print and print(
+                f"Picked the '{engine}' engine: {self.engine_choice['reason']}\n")
+        if engine not in self.ENGINES:
+            raise ValueError(f"unknown engine '{engine}'")
+
+        method, engine_options = self.ENGINES[engine]
+        return getattr(self, method)(starting_time, will_print=will_print, **{**engine_options, **options})
+
+    def schedule_slots(self, starting_time, engine="auto", latency_budget=1.0, **options):
+        """
+        Runs the tasks in the task scheduler with the given engine (see run_task_scheduler) and returns the scheduled tasks
+        with the start times the engine gave them, so fixed-time tasks and the free time before them are kept
+
+        Parameters
+        ----------
+        starting_time : int/float
+          time (in minutes) to start task scheduler
+        engine : str
+            a name from ENGINES or "auto" (default "auto")
+        latency_budget : float
+            maximum running time (in seconds) allowed when engine is "auto" (default 1.0)
+        options : dict
+            further keyword arguments passed on to the engine
+
+        Returns
+        ----------
+        dict
+            the scheduled tasks (id, description, duration, start time and whether it is a busy block, in time order)
+            and the total utility
+
+        """
+        _, total_utility = self.run_task_scheduler(
+            starting_time, engine, will_print=False, latency_budget=latency_budget, **options)
+        scheduled = [{"id": task.id, "description": task.description, "duration": task.duration, "start": start_time,
+                      "busy": task.busy}
+                     for task, start_time, _ in sorted(self.slots, key=lambda slot: slot[1])]
+        return {"tasks": scheduled, "utility": total_utility}
+
+    def deadline_run_task_scheduler(self, starting_time, will_print=True):
+        """
+        Runs the tasks in the task scheduler within their time windows: a task starts no earlier than its release time
+        (the starting time if it has none) and must be completed by its deadline (the end of the time period if it has none).
+        Fixed-time tasks have the window [time, time + duration] and are rejected when it is not within the time period.
+        The windows are first tightened along the dependencies in O(V+E): a task is released no earlier than its
+        dependencies can be completed, and is rejected when it can then no longer meet its deadline (or its fixed time)
+        or when one of its dependencies is rejected. A task is then due early enough for the dependents that can still
+        run to be completed, which never rejects a task; earliest-deadline-first then runs every task after its dependencies.
+        Released tasks are run in earliest-deadline-first order. When a task would miss its deadline, the longest
+        flexible task accepted since the machine was last forced to wait is rejected (Moore–Hodgson), which keeps the
+        number of rejected tasks small; a task is only rejected if the tasks after it can move earlier without starting
+        before their release, and never once a task depending on it has been accepted. The tasks that depend on a rejected task are rejected too. Runs in O(n log n + E).
+
+        Parameters
+        ----------
+        starting_time : int/float
+          time (in minutes) to start task scheduler
+        will_print : bool
+            whether to include print statements or not (included to avoid print statements in experimental time-complexity analysis)
+
+        Returns
+        ----------
+        lst, int
+            a lists of the order the tasks should be executed
+            and the total utility for our task scheduler if will_print is False
+
+        """
+        will_print and print("Running Somto's Deadline scheduler:\n")
+        self.apply_priority_model()
+        max_time = starting_time + self.time_period
+
+        # time window of each task
+        release_times, deadlines = {}, {}
+        for task in self.tasks:
+            task.status = self.NOT_STARTED
+            if task.time is not None:
+                release_times[task] = deadlines[task] = task.time*60
+                deadlines[task] += task.duration
+            else:
+                release_times[task] = starting_time if task.release is None else max(
+                    starting_time, task.release)
+                deadlines[task] = max_time if task.deadline is None else min(
+                    max_time, task.deadline)
+
+        dependencies, dependents, order = self.dependency_graph()
+
+        # push releases forward: a task is released once its dependencies can be completed, and cannot be run
+        # at all when a dependency cannot, or when it can no longer start at its fixed time or meet its deadline
+        rejected = set()
+        for task in order:
+            release_time = max([release_times[task]] + [release_times[dependency] + dependency.duration
+                                                        for dependency in dependencies[task]])
+            if any(dependency in rejected for dependency in dependencies[task]) or (
+                    task.time is not None and (release_time > task.time*60 or task.time*60 < starting_time)) or (
+                    release_time + task.duration > min(deadlines[task], max_time)):
+                rejected.add(task)
+            else:
+                release_times[task] = release_time
+        # pull deadlines backward: a task is due early enough for its dependents that can still run to be completed,
+        # which never passes its release time plus its duration since those dependents are released after it completes
+        for task in reversed(order):
+            if task not in rejected:
+                for dependent in dependents[task]:
+                    if dependent not in rejected:
+                        deadlines[task] = min(deadlines[task], deadlines[dependent] - dependent.duration)
+
+        # minimum heap of (release time, position, task) for tasks not yet released,
+        # and minimum heap of (deadline, -utility, position, task) for released tasks
+        release_queue = [(release_times[task], position, task)
+                         for position, task in enumerate(self.tasks) if task not in rejected]
+        heapq.heapify(release_queue)
+        deadline_queue = []
+
+        # accepted tasks in order, and a maximum heap of (-duration, utility, position, task) for the
+        # flexible tasks that can still be rejected along with the smallest time any later task could move earlier by;
+        # a task that an accepted task depends on can no longer be rejected
+        accepted = []
+        required = set()
+        removable_queue = []
+        min_slack = float('inf')
+
+        current_time = starting_time
+        while release_queue or deadline_queue:
+            # if nothing is released yet, wait for the next release
+            if not deadline_queue and release_queue[0][0] > current_time:
+                current_time = release_queue[0][0]
+            while release_queue and release_queue[0][0] <= current_time:
+                _, position, task = heapq.heappop(release_queue)
+                heapq.heappush(deadline_queue, (deadlines[task], -task.scaled_utility(), position, task))
+
+            _, _, position, task = heapq.heappop(deadline_queue)
+            # a rejection may have moved the time back before the release of a task already in the queue
+            current_time = max(current_time, release_times[task])
+            slack = current_time - release_times[task]
+            # a task started right at its release cannot move earlier, so none of the tasks before it can be rejected
+            if slack == 0:
+                removable_queue = []
+                min_slack = float('inf')
+            else:
+                min_slack = min(min_slack, slack)
+            accepted.append(task)
+            required.update(dependencies[task])
+            if task.time is None:
+                heapq.heappush(removable_queue, (-task.duration, task.scaled_utility(), position, task))
+            current_time += task.duration
+
+            # reject the longest tasks until this one meets its deadline
+            while current_time > deadlines[task]:
+                # skip tasks that were already rejected or that an accepted task depends on
+                while removable_queue and (removable_queue[0][3] in rejected or removable_queue[0][3] in required):
+                    heapq.heappop(removable_queue)
+                longest = removable_queue[0][3] if removable_queue else task
+                # rejecting an earlier task would move the tasks after it before their release, so reject this one instead
+                if longest.duration > min_slack:
+                    longest = task
+                rejected.add(longest)
+                current_time -= longest.duration
+                if longest is task:
+                    break
+                min_slack -= longest.duration
+
+        # a task cannot run without its dependencies
+        for task in order:
+            if task not in rejected and any(dependency in rejected for dependency in task.dependencies):
+                rejected.add(task)
+
+        # replay the accepted tasks to get their start times
+        tasks_order = []
+        self.slots = []
+        total_utility = 0
+        current_time = starting_time
+        for task in accepted:
+            if task in rejected:
+                continue
+            current_time = max(current_time, release_times[task])
+            task.status = self.IN_PROGRESS
+            will_print and print(f"⌚️t={self.format_time(current_time)}")
+            will_print and print(
+                f"\tstarted '{task.description}' for {task.duration} mins...")
+            tasks_order.append(task)
+            self.slots.append((task, current_time, current_time + task.duration))
+            current_time += task.duration
+            total_utility += task.scaled_utility()
+            will_print and print(
+                f"\t✅t={self.format_time(current_time)}, task completed with utility {round(task.utility(), 2)}!\n")
+            task.status = self.COMPLETED
+
+        for task in rejected:
+            will_print and print(
+                f"❌ '{task.description}' does not fit in its time window")
+        total_utility /= UTILITY_SCALE
+        will_print and print(
+            f"\n🏁 Completed all planned tasks in {self.format_time(current_time - starting_time)}min!")
+        will_print and print(f"Total utility: {round(total_utility, 2)}")
+
+        return (tasks_order, total_utility) if not will_print else None